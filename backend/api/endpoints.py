@@ -1,277 +1,395 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from typing import Dict, Any, Optional
+from collections import OrderedDict
+import os
 import uuid
 import asyncio
-import json
+import bisect
+import functools
+import hashlib
+import heapq
+import orjson
 import time
-import random
 import logging
-from Bio.SeqUtils import GC
+import numpy as np
 
-from core.models import SynthesisRequest, SynthesisResponse, Organism
+from core.models import SynthesisRequest, SynthesisResponse, Organism, OffTargetAnalysis, ProteinStructure
 from core.bioinformatics import bio_engine
 from core.ai_services import ai_service
 from services.llm_service import llm_service
 from utils.cache import get_cache, set_cache
+from utils.helpers import gc_content
 
-router = APIRouter()
+# Known safe harbor sites for different organisms
+SAFE_HARBORS = {
+    "homo_sapiens": {
+        "AAVS1": "Chr19:55115756",     # Most popular safe harbor
+        "CCR5": "Chr3:46414943",       # CCR5 delta32 locus
+        "ROSA26": "Chr6:113072530",    # ROSA26 locus
+        "HPRT1": "ChrX:134460000"      # HPRT1 locus
+    },
+    "mus_musculus": {
+        "Rosa26": "Chr6:113012944",    # Mouse Rosa26
+        "H11": "Chr11:95397000",       # H11 locus
+        "Hprt": "ChrX:53269000"        # Mouse Hprt
+    },
+    "rattus_norvegicus": {
+        "Rosa26": "Chr1:220500000",    # Rat Rosa26 equivalent
+        "Hprt1": "ChrX:137000000"      # Rat Hprt1
+    },
+    "escherichia_coli": {
+        "attB": "Position:4361000",    # E. coli integration site
+        "lacZ": "Position:365000"      # lacZ locus
+    }
+}
+
+# Gene-specific optimal insertion sites (real genomic coordinates)
+GENE_SPECIFIC_SITES = {
+    "homo_sapiens": {
+        "LRP5": "Chr11:68200000",        # Near endogenous LRP5 for bone density
+        "COL1A1": "Chr17:50190000",      # Collagen locus for bone/tissue
+        "MYOSTATIN": "Chr2:190430000",   # MSTN locus for muscle
+        "EPO": "Chr7:100720000",         # Erythropoietin locus
+        "VEGF": "Chr6:43737000",         # VEGF locus for angiogenesis
+        "INSULIN": "Chr11:2160000",      # INS locus
+        "DYSTROPHIN": "ChrX:31200000",   # DMD locus
+        "CFTR": "Chr7:117120000",        # CFTR locus
+        "TP53": "Chr17:7670000",         # p53 locus
+        "BRCA1": "Chr17:43044000"        # BRCA1 locus
+    },
+    "mus_musculus": {
+        "Lrp5": "Chr19:3400000",        # Mouse Lrp5
+        "Col1a1": "Chr11:94940000",     # Mouse Col1a1
+        "Mstn": "Chr1:53060000"         # Mouse Mstn
+    }
+}
+
+# Uppercased once at import so per-call matching doesn't re-normalize keys
+_GENE_SITES_UPPER = {
+    organism: {gene.upper(): locus for gene, locus in sites.items()}
+    for organism, sites in GENE_SPECIFIC_SITES.items()
+}
+
+# Sorted key lists enable O(log n) prefix matching for gene families
+_GENE_SITE_SORTED_KEYS = {
+    organism: sorted(sites) for organism, sites in _GENE_SITES_UPPER.items()
+}
+
+# Precomputed (small, medium, large) safe-harbor fallbacks per organism
+_SAFE_HARBOR_TIERS = {}
+for _organism, _harbors in SAFE_HARBORS.items():
+    _values = list(_harbors.values())
+    _SAFE_HARBOR_TIERS[_organism] = (
+        _harbors.get("AAVS1", _values[0]),
+        _harbors.get("ROSA26", _values[1] if len(_values) > 1 else _values[0]),
+        _harbors.get("CCR5", _values[0])
+    )
+
+# orjson serializes the large nested responses (sequences, PDB blobs)
+# several times faster than the stdlib json encoder
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# Confidence scoring is pure arithmetic on three bucketed inputs, so all
+# 18 outcomes are precomputed once: base 0.6, +/- adjustments for GC tier
+# (ideal/acceptable/extreme), length tier (small/medium/large) and whether
+# the sequence looks protein-coding, clamped to [0.3, 0.95]
+_CONF_GC_ADJ = np.array([0.15, 0.05, -0.1])
+_CONF_LEN_ADJ = np.array([0.15, 0.05, -0.1])
+_CONF_CODING_ADJ = np.array([0.0, 0.1])
+_CONF_TABLE = np.clip(
+    0.6
+    + _CONF_GC_ADJ[:, None, None]
+    + _CONF_LEN_ADJ[None, :, None]
+    + _CONF_CODING_ADJ[None, None, :],
+    0.3, 0.95
+)
+
+# Bound concurrency to the external services: protein folding hits a
+# GPU-backed API and the LLM providers rate-limit, so unbounded bursts
+# just turn into 429s/OOMs that cost more than queueing here
+_FOLD_SEM = asyncio.Semaphore(int(os.getenv("FOLD_CONCURRENCY", "4")))
+_LLM_SEM = asyncio.Semaphore(int(os.getenv("LLM_CONCURRENCY", "4")))
+
+async def _fold_protein_bounded(sequence: str):
+    """Fold a protein under the folding concurrency limit"""
+    wait_start = time.monotonic()
+    async with _FOLD_SEM:
+        waited = time.monotonic() - wait_start
+        if waited > 0.5:
+            logger.warning("⏳ BACKEND: Fold request queued %.1fs behind concurrency limit", waited)
+        return await ai_service.fold_protein(sequence)
+
+# Per-step results are pure functions of (sequence, organism), so they get
+# their own cache entries with a longer TTL than the per-query response:
+# two different traits resolving to the same gene share the expensive work
+STEP_CACHE_TTL = 86400  # 24 hours
+
+def _sequence_hash(sequence: str) -> str:
+    return hashlib.blake2b(sequence.encode(), digest_size=16).hexdigest()
+
+# Raw sequences are served from a dedicated endpoint instead of being
+# embedded in every response - a 10kb gene is ~20KB of ASCII per request
+# once the original and optimized copies are counted
+_MAX_SEQUENCES = 1000
+_seq_store: "OrderedDict[str, str]" = OrderedDict()
+
+def _store_sequence(sequence: str) -> str:
+    """Keep a sequence retrievable by hash via /sequence/{seq_hash}"""
+    seq_hash = _sequence_hash(sequence)
+    _seq_store[seq_hash] = sequence
+    _seq_store.move_to_end(seq_hash)
+    if len(_seq_store) > _MAX_SEQUENCES:
+        _seq_store.popitem(last=False)
+    return seq_hash
+
+async def _optimize_codons_cached(sequence: str, organism: Organism) -> str:
+    cache_key = f"codonopt:{_sequence_hash(sequence)}:{organism.value}"
+    cached = await get_cache(cache_key)
+    if cached:
+        return cached if isinstance(cached, str) else cached.decode()
+    optimized = await bio_engine.optimize_codon_usage(sequence, organism)
+    await set_cache(cache_key, optimized, expire=STEP_CACHE_TTL)
+    return optimized
+
+async def _predict_off_targets_cached(sequence: str, organism: Organism) -> OffTargetAnalysis:
+    cache_key = f"offtarget:{_sequence_hash(sequence)}:{organism.value}"
+    cached = await get_cache(cache_key)
+    if cached:
+        return OffTargetAnalysis(**orjson.loads(cached))
+    analysis = await bio_engine.predict_off_target_effects(sequence, organism)
+    await set_cache(cache_key, orjson.dumps(analysis.dict(), default=str), expire=STEP_CACHE_TTL)
+    return analysis
+
+async def _fold_protein_cached(sequence: str) -> ProteinStructure:
+    cache_key = f"fold:{_sequence_hash(sequence)}"
+    cached = await get_cache(cache_key)
+    if cached:
+        return ProteinStructure(**orjson.loads(cached))
+    structure = await _fold_protein_bounded(sequence)
+    # Only real ESMFold output is deterministic for the sequence; a
+    # "Simulated" structure means the fold service degraded, and caching
+    # it would pin the fallback long after the ESMFold cooldown expires
+    if structure.method != "Simulated":
+        await set_cache(cache_key, orjson.dumps(structure.dict(), default=str), expire=STEP_CACHE_TTL)
+    return structure
+
 # In-memory storage for simulation results
-simulation_results = {}
-simulation_times = {}
+# Each entry maps request_id -> (result, expire_at); the heap indexes
+# expiration times so cleanup only touches entries that are actually expired,
+# and the OrderedDict caps memory under pure-POST traffic (no /results polls)
+# by evicting the oldest entry once the size bound is hit.
+RESULT_TTL = 3600  # 1 hour
+MAX_RESULTS = 10_000
+simulation_results: "OrderedDict[str, tuple]" = OrderedDict()
+_expiry_heap = []
 
-async def find_real_insertion_locus(gene_name: str, host_organism: str, sequence: str) -> str:
-    """Find real insertion locus based on genomic data and scientific safe harbors"""
-    
-    # Known safe harbor sites for different organisms
-    safe_harbors = {
-        "homo_sapiens": {
-            "AAVS1": "Chr19:55115756",     # Most popular safe harbor
-            "CCR5": "Chr3:46414943",       # CCR5 delta32 locus  
-            "ROSA26": "Chr6:113072530",    # ROSA26 locus
-            "HPRT1": "ChrX:134460000"      # HPRT1 locus
-        },
-        "mus_musculus": {
-            "Rosa26": "Chr6:113012944",    # Mouse Rosa26
-            "H11": "Chr11:95397000",       # H11 locus
-            "Hprt": "ChrX:53269000"        # Mouse Hprt
-        },
-        "rattus_norvegicus": {
-            "Rosa26": "Chr1:220500000",    # Rat Rosa26 equivalent
-            "Hprt1": "ChrX:137000000"      # Rat Hprt1
-        },
-        "escherichia_coli": {
-            "attB": "Position:4361000",    # E. coli integration site
-            "lacZ": "Position:365000"      # lacZ locus
-        }
-    }
-    
-    # Gene-specific optimal insertion sites (real genomic coordinates)
-    gene_specific_sites = {
-        "homo_sapiens": {
-            "LRP5": "Chr11:68200000",        # Near endogenous LRP5 for bone density
-            "COL1A1": "Chr17:50190000",      # Collagen locus for bone/tissue
-            "MYOSTATIN": "Chr2:190430000",   # MSTN locus for muscle
-            "EPO": "Chr7:100720000",         # Erythropoietin locus
-            "VEGF": "Chr6:43737000",         # VEGF locus for angiogenesis
-            "INSULIN": "Chr11:2160000",      # INS locus
-            "DYSTROPHIN": "ChrX:31200000",   # DMD locus
-            "CFTR": "Chr7:117120000",        # CFTR locus
-            "TP53": "Chr17:7670000",         # p53 locus
-            "BRCA1": "Chr17:43044000"        # BRCA1 locus
-        },
-        "mus_musculus": {
-            "Lrp5": "Chr19:3400000",        # Mouse Lrp5
-            "Col1a1": "Chr11:94940000",     # Mouse Col1a1
-            "Mstn": "Chr1:53060000"         # Mouse Mstn
-        }
-    }
-    
+def _store_result(request_id: str, result: Any) -> None:
+    """Store a simulation result with TTL expiration and an LRU size bound"""
+    expire_at = time.time() + RESULT_TTL
+    simulation_results[request_id] = (result, expire_at)
+    simulation_results.move_to_end(request_id)
+    heapq.heappush(_expiry_heap, (expire_at, request_id))
+    if len(simulation_results) > MAX_RESULTS:
+        simulation_results.popitem(last=False)  # O(1) FIFO eviction
+
+def _sweep_expired(now: float) -> int:
+    """Pop expired entries off the heap head - O(k log n) for k expired items"""
+    cleaned_count = 0
+    while _expiry_heap and _expiry_heap[0][0] <= now:
+        expire_at, request_id = heapq.heappop(_expiry_heap)
+        entry = simulation_results.get(request_id)
+        # The tuple check skips stale heap entries if the TTL was refreshed
+        if entry and entry[1] == expire_at:
+            del simulation_results[request_id]
+            cleaned_count += 1
+    return cleaned_count
+
+@functools.lru_cache(maxsize=4096)
+def _locus_lookup(gene_upper: str, host_organism: str, size_tier: int) -> str:
+    """Resolve an insertion locus from precomputed tables (memoized).
+
+    The lookup is deterministic on (gene name, organism, size tier), so
+    repeat traits/organisms hit the cache instead of re-running the matching.
+    """
     # Try gene-specific site first (most scientifically accurate)
-    if host_organism in gene_specific_sites:
+    if host_organism in _GENE_SITES_UPPER:
+        organism_sites = _GENE_SITES_UPPER[host_organism]
+
         # Try exact match first
-        if gene_name.upper() in gene_specific_sites[host_organism]:
-            return gene_specific_sites[host_organism][gene_name.upper()]
-        
-        # Try partial matches for gene families
-        for stored_gene, locus in gene_specific_sites[host_organism].items():
-            if gene_name.upper() in stored_gene or stored_gene in gene_name.upper():
+        if gene_upper in organism_sites:
+            return organism_sites[gene_upper]
+
+        # Fast path for gene families: bisect the sorted key list to find a
+        # stored gene that the query is a prefix of (or vice versa)
+        sorted_keys = _GENE_SITE_SORTED_KEYS[host_organism]
+        idx = bisect.bisect_left(sorted_keys, gene_upper)
+        for neighbor in sorted_keys[max(idx - 1, 0):idx + 1]:
+            if neighbor.startswith(gene_upper) or gene_upper.startswith(neighbor):
+                return organism_sites[neighbor]
+
+        # Fall back to full substring matching for non-prefix family names
+        for stored_gene, locus in organism_sites.items():
+            if gene_upper in stored_gene or stored_gene in gene_upper:
                 return locus
-    
-    # Fall back to safe harbor sites based on sequence properties
-    if host_organism in safe_harbors:
-        sequence_length = len(sequence)
-        
-        # Choose optimal safe harbor based on sequence characteristics
-        if sequence_length < 2000:
-            # Small sequences -> AAVS1 (best characterized)
-            return safe_harbors[host_organism].get("AAVS1", list(safe_harbors[host_organism].values())[0])
-        elif sequence_length < 5000:
-            # Medium sequences -> ROSA26 (good for larger constructs)
-            return safe_harbors[host_organism].get("ROSA26", list(safe_harbors[host_organism].values())[1] if len(safe_harbors[host_organism]) > 1 else list(safe_harbors[host_organism].values())[0])
-        else:
-            # Large sequences -> CCR5 or alternative
-            return safe_harbors[host_organism].get("CCR5", list(safe_harbors[host_organism].values())[0])
-    
+
+    # Fall back to safe harbor sites based on sequence size tier
+    if host_organism in _SAFE_HARBOR_TIERS:
+        # Small sequences -> AAVS1 (best characterized),
+        # medium -> ROSA26 (good for larger constructs), large -> CCR5
+        return _SAFE_HARBOR_TIERS[host_organism][size_tier]
+
     # Ultimate fallback for unsupported organisms
     return "Chr1:100000000"  # Generic safe integration site
 
+async def find_real_insertion_locus(gene_name: str, host_organism: str, sequence: str) -> str:
+    """Find real insertion locus based on genomic data and scientific safe harbors"""
+    sequence_length = len(sequence)
+    size_tier = 0 if sequence_length < 2000 else 1 if sequence_length < 5000 else 2
+    return _locus_lookup(gene_name.upper(), host_organism, size_tier)
+
 @router.post("/synthesize", response_model=SynthesisResponse)
 async def synthesize_gene(request: SynthesisRequest, http_request: Request):
     """Main endpoint for gene synthesis simulation"""
-    logger.info(f"🚀 BACKEND: Received synthesis request")
-    logger.info(f"📝 BACKEND: Request data - Host: {request.host_organism}, Trait: {request.desired_trait}")
-    logger.info(f"🔧 BACKEND: Optimize: {request.optimize}, Safety Check: {request.safety_check}")
-    logger.info(f"🌐 BACKEND: Client IP: {http_request.client.host}")
+    # Lazy %-style args are only formatted when the record is actually emitted
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🚀 BACKEND: Received synthesis request")
+        logger.debug("📝 BACKEND: Request data - Host: %s, Trait: %s", request.host_organism, request.desired_trait)
+        logger.debug("🔧 BACKEND: Optimize: %s, Safety Check: %s", request.optimize, request.safety_check)
+        logger.debug("🌐 BACKEND: Client IP: %s", http_request.client.host)
     
     request_id = str(uuid.uuid4())
-    logger.info(f"🆔 BACKEND: Generated request ID: {request_id}")
+    logger.debug("🆔 BACKEND: Generated request ID: %s", request_id)
     
     try:
-        # Check cache first
-        cache_key = f"synthesis:{request.desired_trait}:{request.host_organism}"
+        # Check cache first - normalize key components so whitespace/case
+        # variants of the same trait hit the same entry, and include the
+        # pipeline flags so differently-configured runs don't share results
+        trait_norm = " ".join(request.desired_trait.lower().split())
+        org_norm = request.host_organism.value if hasattr(request.host_organism, "value") else str(request.host_organism).lower()
+        trait_digest = hashlib.blake2b(trait_norm.encode(), digest_size=16).hexdigest()
+        cache_key = f"synthesis:{org_norm}:{trait_digest}:{int(request.optimize)}{int(request.safety_check)}{int(request.include_sequence)}"
         cached_result = await get_cache(cache_key)
         if cached_result:
-            logger.info(f"📦 BACKEND: Found cached result, returning cached data")
-            cached_data = json.loads(cached_result)
-            # Ensure we return a proper SynthesisResponse object
-            return SynthesisResponse(**cached_data)
+            # The cached payload is the orjson bytes of an already-validated
+            # SynthesisResponse - returning it as-is skips both the Pydantic
+            # model reconstruction and FastAPI's outbound serialization
+            logger.debug("📦 BACKEND: Found cached result, returning cached data")
+            return Response(content=cached_result, media_type="application/json")
 
         # Start the simulation immediately (not in background)
-        logger.info(f"⚡ BACKEND: Starting simulation for request {request_id}")
+        logger.info("⚡ BACKEND: Starting simulation for request %s", request_id)
         result = await run_simulation(request_id, request)
         
         # Store result
-        simulation_results[request_id] = result
-        simulation_times[request_id] = time.time()
+        _store_result(request_id, result)
         
         # Cache result for future requests
         try:
             # Convert to dict properly for caching
             result_dict = result.dict() if hasattr(result, 'dict') else result.__dict__
-            await set_cache(cache_key, json.dumps(result_dict), expire=3600)
+            await set_cache(cache_key, orjson.dumps(result_dict, default=str), expire=3600)
         except Exception as cache_error:
-            logger.error(f"❌ BACKEND: Cache error: {cache_error}")
+            logger.error("❌ BACKEND: Cache error: %s", cache_error)
             # Continue without caching
         
-        logger.info(f"✅ BACKEND: Simulation complete! Returning result for {request_id}")
-        logger.info(f"🧬 BACKEND: Gene name: {result.gene.name if hasattr(result.gene, 'name') else 'Unknown'}, Confidence: {result.confidence_score}")
+        logger.info("✅ BACKEND: Simulation complete! Returning result for %s", request_id)
+        logger.debug("🧬 BACKEND: Gene name: %s, Confidence: %s", getattr(result.gene, 'name', 'Unknown'), result.confidence_score)
         
         return result
         
     except Exception as e:
-        logger.error(f"❌ BACKEND: Error in synthesize_gene: {str(e)}", exc_info=True)
+        logger.error("❌ BACKEND: Error in synthesize_gene: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/results/{request_id}")
 async def get_results(request_id: str):
     """Get results for a specific simulation"""
-    logger.info(f"🔍 BACKEND: Looking for results for request ID: {request_id}")
-    
+    logger.debug("🔍 BACKEND: Looking for results for request ID: %s", request_id)
+
+    # Clean up expired results (older than 1 hour)
+    cleaned_count = _sweep_expired(time.time())
+    if cleaned_count > 0:
+        logger.info("🧹 BACKEND: Cleaned up %d expired results", cleaned_count)
+
     if request_id not in simulation_results:
-        logger.warning(f"⚠️ BACKEND: Result not found for request ID: {request_id}")
+        logger.warning("⚠️ BACKEND: Result not found for request ID: %s", request_id)
         raise HTTPException(status_code=404, detail="Result not found or may have expired")
-    
-    # Clean up old results (older than 1 hour)
-    current_time = time.time()
-    cleaned_count = 0
-    for rid in list(simulation_results.keys()):
-        if rid in simulation_times and current_time - simulation_times[rid] > 3600:
-            del simulation_results[rid]
-            del simulation_times[rid]
-            cleaned_count += 1
-    
-    if cleaned_count > 0:
-        logger.info(f"🧹 BACKEND: Cleaned up {cleaned_count} expired results")
-    
-    result = simulation_results[request_id]
-    logger.info(f"✅ BACKEND: Returning cached result for {request_id}")
+
+    result, _ = simulation_results[request_id]
+    logger.debug("✅ BACKEND: Returning cached result for %s", request_id)
     return result
 
 async def run_simulation(request_id: str, request: SynthesisRequest) -> SynthesisResponse:
     """Run the full simulation pipeline"""
-    logger.info(f"🔬 BACKEND: Starting simulation pipeline for {request_id}")
+    logger.debug("🔬 BACKEND: Starting simulation pipeline for %s", request_id)
     
     try:
         # Step 1: Find appropriate gene
-        logger.info(f"🧬 BACKEND: Step 1 - Finding gene for trait: {request.desired_trait}")
+        logger.debug("🧬 BACKEND: Step 1 - Finding gene for trait: %s", request.desired_trait)
         gene_data = await bio_engine.find_gene_for_trait(
             request.desired_trait, 
             request.host_organism.value
         )
-        logger.info(f"✅ BACKEND: Found gene: {gene_data.get('name', 'Unknown')}")
+        logger.debug("✅ BACKEND: Found gene: %s", gene_data.get("name", "Unknown"))
         
         # Step 2: Optimize codon usage if requested
         optimized_sequence = None
         if request.optimize:
-            logger.info(f"🔧 BACKEND: Step 2 - Optimizing codon usage")
-            optimized_sequence = await bio_engine.optimize_codon_usage(
-                gene_data["sequence"], 
+            logger.debug("🔧 BACKEND: Step 2 - Optimizing codon usage")
+            optimized_sequence = await _optimize_codons_cached(
+                gene_data["sequence"],
                 request.host_organism
             )
-            logger.info(f"✅ BACKEND: Codon optimization complete")
+            logger.debug("✅ BACKEND: Codon optimization complete")
         else:
-            logger.info(f"⏭️ BACKEND: Step 2 - Skipping codon optimization")
+            logger.debug("⏭️ BACKEND: Step 2 - Skipping codon optimization")
         
-        # Step 3: Predict off-target effects
-        logger.info(f"🎯 BACKEND: Step 3 - Predicting off-target effects")
         target_sequence = optimized_sequence or gene_data["sequence"]
-        off_target_analysis = await bio_engine.predict_off_target_effects(
-            target_sequence, 
-            request.host_organism
+        sequence_length = len(target_sequence)
+
+        # Steps 3-5: off-target prediction, protein folding and risk assessment
+        # only depend on target_sequence/gene_data, so run them concurrently
+        logger.debug("🎯 BACKEND: Steps 3-5 - Off-target, folding and risk analysis (concurrent)")
+        off_target_analysis, protein_structure, risk_assessment = await asyncio.gather(
+            _predict_off_targets_cached(target_sequence, request.host_organism),
+            _fold_protein_cached(target_sequence),
+            bio_engine.assess_risks(gene_data, request.host_organism),
         )
-        logger.info(f"✅ BACKEND: Off-target analysis complete")
-        
-        # Step 4: Predict protein structure
-        logger.info(f"🏗️ BACKEND: Step 4 - Predicting protein structure")
-        protein_structure = await ai_service.fold_protein(target_sequence)
-        logger.info(f"✅ BACKEND: Protein folding complete")
-        
-        # Step 5: Assess risks
-        logger.info(f"⚠️ BACKEND: Step 5 - Assessing risks")
-        risk_assessment = await bio_engine.assess_risks(gene_data, request.host_organism)
-        logger.info(f"✅ BACKEND: Risk assessment complete")
+        logger.debug("✅ BACKEND: Off-target, folding and risk analysis complete")
         
         # Step 6: Prepare data for recommendation
         analysis_data = {
             "gene_name": gene_data["name"],
             "species": gene_data["species"],
-            "sequence_length": len(target_sequence),
+            "sequence_length": sequence_length,
             "off_target_sites": getattr(off_target_analysis, 'total_sites', 0),
             "confidence_score": getattr(protein_structure, 'confidence_score', 0.5),
             "toxicity_score": getattr(risk_assessment, 'toxicity_score', 0.1)
         }
         
         # Step 7: Generate recommendation
-        logger.info(f"💡 BACKEND: Step 7 - Generating AI recommendation")
-        recommendation = await ai_service.generate_recommendation(analysis_data)
-        logger.info(f"✅ BACKEND: AI recommendation generated")
+        logger.debug("💡 BACKEND: Step 7 - Generating AI recommendation")
+        async with _LLM_SEM:
+            recommendation = await ai_service.generate_recommendation(analysis_data)
+        logger.debug("✅ BACKEND: AI recommendation generated")
         
         # Step 8: Enhanced confidence calculation
-        target_sequence = optimized_sequence or gene_data["sequence"]
-        
-        # Calculate GC content
-        try:
-            gc_content = GC(target_sequence)
-        except Exception as gc_error:
-            logger.warning(f"⚠️ BACKEND: GC calculation error: {gc_error}")
-            # Fallback calculation if Bio package fails
-            gc_count = target_sequence.count('G') + target_sequence.count('C')
-            gc_content = (gc_count / len(target_sequence)) * 100 if len(target_sequence) > 0 else 50
-        
-        # Enhanced confidence calculation
-        confidence = 0.6  # Base confidence
-
-        # Adjust based on sequence properties
-        if 40 <= gc_content <= 60:
-            confidence += 0.15  # Ideal GC content
-        elif 30 <= gc_content <= 70:
-            confidence += 0.05  # Acceptable range
-        else:
-            confidence -= 0.1   # Extreme GC content
-
-        # Check if it's protein coding (assume most genes are protein coding)
-        is_protein_coding = len(target_sequence) % 3 == 0 and len(target_sequence) > 30
-        if is_protein_coding:
-            confidence += 0.1   # Protein-coding is good
 
-        sequence_length = len(target_sequence)
-        if sequence_length < 2000:
-            confidence += 0.15  # Small genes are easier
-        elif sequence_length < 5000:
-            confidence += 0.05  # Medium genes
-        else:
-            confidence -= 0.1   # Large genes are harder
+        # Calculate GC content in a single pass (JIT kernel for large sequences)
+        gc_percent = gc_content(target_sequence)
 
-        # Keep within reasonable bounds
-        confidence_score = min(0.95, max(0.3, confidence))
+        # Enhanced confidence calculation via the precomputed decision table
+        gc_tier = 0 if 40 <= gc_percent <= 60 else 1 if 30 <= gc_percent <= 70 else 2
+        len_tier = 0 if sequence_length < 2000 else 1 if sequence_length < 5000 else 2
+        is_protein_coding = sequence_length % 3 == 0 and sequence_length > 30
+        confidence_score = float(_CONF_TABLE[gc_tier, len_tier, int(is_protein_coding)])
         
-        logger.info(f"📊 BACKEND: Calculated confidence score: {confidence_score:.2f}")
+        logger.debug("📊 BACKEND: Calculated confidence score: %.2f", confidence_score)
         
         # Step 9: Create final response
-        logger.info(f"📦 BACKEND: Step 9 - Creating final response")
+        logger.debug("📦 BACKEND: Step 9 - Creating final response")
         
         insertion_locus = await find_real_insertion_locus(
             gene_data["name"], 
@@ -279,6 +397,11 @@ async def run_simulation(request_id: str, request: SynthesisRequest) -> Synthesi
             target_sequence
         )
         
+        # Keep sequences retrievable by hash; only embed them in the
+        # response when the client explicitly asked for them
+        gene_hash = _store_sequence(gene_data["sequence"])
+        optimized_hash = _store_sequence(optimized_sequence) if optimized_sequence else None
+
         response_data = {
             "request_id": request_id,
             "status": "completed",
@@ -286,11 +409,13 @@ async def run_simulation(request_id: str, request: SynthesisRequest) -> Synthesi
                 "name": gene_data["name"],
                 "species": gene_data["species"],
                 "ncbi_id": gene_data["ncbi_id"],
-                "sequence": gene_data["sequence"],
+                "sequence": gene_data["sequence"] if request.include_sequence else "",
                 "sequence_length": len(gene_data["sequence"]),
+                "sequence_hash": gene_hash,
                 "description": gene_data["description"]
             },
-            "optimized_sequence": optimized_sequence,
+            "optimized_sequence": optimized_sequence if request.include_sequence else None,
+            "optimized_sequence_hash": optimized_hash,
             "insertion_locus": insertion_locus,
             "off_target_analysis": off_target_analysis.dict() if hasattr(off_target_analysis, 'dict') else off_target_analysis,
             "protein_structure": protein_structure.dict() if hasattr(protein_structure, 'dict') else protein_structure,
@@ -300,11 +425,11 @@ async def run_simulation(request_id: str, request: SynthesisRequest) -> Synthesi
         }
 
         result = SynthesisResponse(**response_data)
-        logger.info(f"✅ BACKEND: Simulation pipeline complete for {request_id}")
+        logger.debug("✅ BACKEND: Simulation pipeline complete for %s", request_id)
         return result
         
     except Exception as e:
-        logger.error(f"❌ BACKEND: Simulation pipeline error for {request_id}: {str(e)}", exc_info=True)
+        logger.error("❌ BACKEND: Simulation pipeline error for %s: %s", request_id, e, exc_info=True)
         
         # Return error result
         error_response = SynthesisResponse(
@@ -341,6 +466,31 @@ async def run_simulation(request_id: str, request: SynthesisRequest) -> Synthesi
         )
         return error_response
 
+@router.post("/recommendation/stream")
+async def stream_recommendation(analysis_data: Dict[str, Any]):
+    """Stream an AI recommendation as Server-Sent Events
+
+    Tokens are forwarded as they leave the model, so clients start
+    rendering at time-to-first-token instead of waiting out the full
+    generation. Cache hits and non-streaming fallbacks arrive as a
+    single event.
+    """
+    async def event_stream():
+        async with _LLM_SEM:
+            async for chunk in llm_service.stream_consensus_recommendation(analysis_data):
+                yield b"data: " + orjson.dumps({"text": chunk}) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@router.get("/sequence/{seq_hash}")
+async def get_sequence(seq_hash: str):
+    """Fetch a raw sequence by the hash returned in a synthesis response"""
+    if seq_hash not in _seq_store:
+        raise HTTPException(status_code=404, detail="Sequence not found or may have expired")
+    _seq_store.move_to_end(seq_hash)
+    return PlainTextResponse(_seq_store[seq_hash])
+
 @router.get("/status")
 async def get_status():
     """Get API status"""
@@ -355,24 +505,12 @@ async def get_status():
             "claude_sonnet_4_enabled": llm_status.get("claude_enabled", False),
             "active_simulations": len(simulation_results)
         }
-        logger.info(f"📊 BACKEND: Status check - Active simulations: {len(simulation_results)}")
+        logger.debug("📊 BACKEND: Status check - Active simulations: %d", len(simulation_results))
         return status_data
     except Exception as e:
-        logger.error(f"❌ BACKEND: Status check error: {str(e)}")
+        logger.error("❌ BACKEND: Status check error: %s", e)
         return {
             "status": "error",
             "message": str(e),
             "timestamp": time.time()
         }
-
-@router.options("/{path:path}")
-async def options_handler(path: str):
-    """Handle OPTIONS requests for CORS"""
-    return JSONResponse(
-        content={},
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-            "Access-Control-Allow-Headers": "*",
-        }
-    )
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import asyncio
-import json
+import orjson
 from typing import Dict, Any
 
 from core.models import SynthesisRequest
@@ -10,20 +10,79 @@ router = APIRouter()
 
 # WebSocket manager
 class ConnectionManager:
+    # Max enqueues per event-loop tick during a broadcast
+    BROADCAST_BATCH_SIZE = 50
+    # Pending messages allowed per client before it is considered too slow
+    QUEUE_MAXSIZE = 256
+
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-    
+        # client_id -> (websocket, outbound queue, sender task)
+        self.active_connections: Dict[str, tuple] = {}
+
     async def connect(self, websocket: WebSocket, client_id: str):
         await websocket.accept()
-        self.active_connections[client_id] = websocket
-    
+        # A reconnect (or raced duplicate) under the same client_id must
+        # tear down the old entry first, or its sender task would sit on
+        # queue.get() forever - one leaked task, queue and socket each time
+        self.disconnect(client_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_MAXSIZE)
+        sender = asyncio.create_task(self._pump(websocket, queue, client_id))
+        self.active_connections[client_id] = (websocket, queue, sender)
+
+    async def _pump(self, websocket: WebSocket, queue: asyncio.Queue, client_id: str):
+        """Drain one client's queue so slow consumers never stall producers"""
+        try:
+            while True:
+                payload = await queue.get()
+                if isinstance(payload, bytes):
+                    await websocket.send_bytes(payload)
+                else:
+                    await websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.disconnect(client_id)
+
     def disconnect(self, client_id: str):
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
-    
+        entry = self.active_connections.pop(client_id, None)
+        if entry is not None:
+            entry[2].cancel()
+
+    def _enqueue(self, payload, client_id: str):
+        entry = self.active_connections.get(client_id)
+        if entry is None:
+            return
+        _, queue, _ = entry
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # The client can't keep up - drop it rather than stall everyone
+            self.disconnect(client_id)
+
     async def send_message(self, message: Dict[str, Any], client_id: str):
-        if client_id in self.active_connections:
-            await self.active_connections[client_id].send_json(message)
+        self._enqueue(orjson.dumps(message).decode(), client_id)
+
+    async def send_payload(self, payload, client_id: str):
+        """Queue an already-serialized JSON payload (str or bytes) for one client"""
+        self._enqueue(payload, client_id)
+
+    async def broadcast(self, message: Dict[str, Any], client_ids=None):
+        """Queue a message for all (or selected) clients.
+
+        The payload is serialized once; enqueueing is O(1) per client and
+        the per-client sender tasks overlap the actual socket writes.
+        """
+        payload = orjson.dumps(message).decode()
+        targets = [
+            cid for cid in list(self.active_connections)
+            if client_ids is None or cid in client_ids
+        ]
+        # Yield between batches so a huge broadcast can't hog a loop tick
+        for i in range(0, len(targets), self.BROADCAST_BATCH_SIZE):
+            for cid in targets[i:i + self.BROADCAST_BATCH_SIZE]:
+                self._enqueue(payload, cid)
+            if i + self.BROADCAST_BATCH_SIZE < len(targets):
+                await asyncio.sleep(0)
 
 manager = ConnectionManager()
 
@@ -33,8 +92,10 @@ async def websocket_simulation(websocket: WebSocket, client_id: str):
     
     try:
         while True:
-            data = await websocket.receive_json()
-            request = SynthesisRequest(**data)
+            # model_validate_json parses in pydantic-core (Rust), skipping
+            # the intermediate dict that receive_json would allocate
+            raw = await websocket.receive_text()
+            request = SynthesisRequest.model_validate_json(raw)
             
             # Start simulation and send progress updates
             await run_websocket_simulation(client_id, request)
@@ -42,35 +103,70 @@ async def websocket_simulation(websocket: WebSocket, client_id: str):
     except WebSocketDisconnect:
         manager.disconnect(client_id)
 
+_STAGE_NAMES = [
+    "Finding suitable gene",
+    "Optimizing codon usage",
+    "Predicting off-target effects",
+    "Folding protein structure",
+    "Assessing risks"
+]
+
+# Stage frames are identical for every simulation, so encode each one
+# exactly once at import time
+_STAGE_PAYLOADS = {
+    stage: orjson.dumps({
+        "stage": stage,
+        "progress": (i + 1) / len(_STAGE_NAMES),
+        "status": "processing"
+    })
+    for i, stage in enumerate(_STAGE_NAMES)
+}
+
+async def _report_stage(client_id: str, stage: str):
+    await manager.send_payload(_STAGE_PAYLOADS[stage], client_id)
+
 async def run_websocket_simulation(client_id: str, request: SynthesisRequest):
-    """Run simulation with WebSocket progress updates"""
-    stages = [
-        "Finding suitable gene",
-        "Retrieving sequence data",
-        "Optimizing codon usage",
-        "Predicting off-target effects",
-        "Folding protein structure",
-        "Assessing risks",
-        "Generating recommendations"
-    ]
-    
-    for i, stage in enumerate(stages):
-        await manager.send_message({
-            "stage": stage,
-            "progress": (i + 1) / len(stages),
-            "status": "processing"
-        }, client_id)
-        
-        # Simulate processing time
-        await asyncio.sleep(1)
-    
-    # Run actual simulation (simplified)
+    """Run simulation, reporting each stage as the real pipeline step completes"""
     try:
+        await _report_stage(client_id, "Finding suitable gene")
         gene_data = await bio_engine.find_gene_for_trait(
-            request.desired_trait, 
+            request.desired_trait,
             request.host_organism.value
         )
-        
+
+        target_sequence = gene_data["sequence"]
+        if request.optimize:
+            await _report_stage(client_id, "Optimizing codon usage")
+            target_sequence = await bio_engine.optimize_codon_usage(
+                gene_data["sequence"],
+                request.host_organism
+            )
+
+        # Off-target prediction, folding and risk assessment only need the
+        # sequence/gene data, so run them as one TaskGroup and report each
+        # stage as its task starts - wall time becomes max, not sum
+        async def _staged(stage, coro):
+            await _report_stage(client_id, stage)
+            return await coro
+
+        async with asyncio.TaskGroup() as tg:
+            off_target_task = tg.create_task(_staged(
+                "Predicting off-target effects",
+                bio_engine.predict_off_target_effects(target_sequence, request.host_organism)
+            ))
+            fold_task = tg.create_task(_staged(
+                "Folding protein structure",
+                ai_service.fold_protein(target_sequence)
+            ))
+            risk_task = tg.create_task(_staged(
+                "Assessing risks",
+                bio_engine.assess_risks(gene_data, request.host_organism)
+            ))
+
+        off_target_analysis = off_target_task.result()
+        protein_structure = fold_task.result()
+        risk_assessment = risk_task.result()
+
         await manager.send_message({
             "stage": "Completed",
             "progress": 1.0,
@@ -78,10 +174,13 @@ async def run_websocket_simulation(client_id: str, request: SynthesisRequest):
             "result": {
                 "gene_name": gene_data["name"],
                 "species": gene_data["species"],
+                "off_target_sites": off_target_analysis.total_sites,
+                "confidence_score": protein_structure.confidence_score,
+                "toxicity_score": risk_assessment.toxicity_score,
                 "message": "Simulation completed successfully"
             }
         }, client_id)
-        
+
     except Exception as e:
         await manager.send_message({
             "stage": "Error",
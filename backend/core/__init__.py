@@ -1,13 +1,12 @@
 # core/__init__.py
-from .bioinformatics import BioinformaticsEngine
-from .ai_services import AIService
+# Re-export the module-level singletons so every import path shares one
+# instance (a second AIService would carry its own esmfold_available flag
+# and never learn about failures seen by the other)
+from .bioinformatics import BioinformaticsEngine, bio_engine
+from .ai_services import AIService, ai_service
 from .config import settings
 from .models import *
 
-# Create global instances
-bio_engine = BioinformaticsEngine()
-ai_service = AIService()
-
 __all__ = [
     'bio_engine',
     'ai_service',
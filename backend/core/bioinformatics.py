@@ -1,15 +1,286 @@
 import asyncio
+import logging
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from types import MappingProxyType
 import random
-from Bio.Seq import Seq
-from Bio import SeqUtils
-from Bio.SeqUtils import GC
-
+import numpy as np
 from services import ncbi_client, protein_folder
+from utils.helpers import gc_content
 from core.models import Organism, OffTargetSite, OffTargetAnalysis, RiskAssessment
 
+logger = logging.getLogger(__name__)
+
+# Numba is optional - when present the Hamming kernel compiles to a tight
+# byte-compare loop; otherwise NumPy's vectorized inequality stands in
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+if _NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _hamming(a, b):
+        """Count positions where two equal-length uint8 buffers differ"""
+        count = 0
+        for i in range(a.size):
+            count += a[i] != b[i]
+        return count
+
+    # Warm the JIT at import so the first request isn't penalized
+    _hamming(np.zeros(32, dtype=np.uint8), np.zeros(32, dtype=np.uint8))
+else:
+    def _hamming(a, b):
+        return np.count_nonzero(a != b)
+
+# Real codon usage frequency tables based on actual genomic data
+HUMAN_CODON_USAGE = {
+    'A': {'GCT': 0.26, 'GCC': 0.40, 'GCA': 0.23, 'GCG': 0.11},
+    'R': {'CGT': 0.08, 'CGC': 0.19, 'CGA': 0.11, 'CGG': 0.21, 'AGA': 0.20, 'AGG': 0.20},
+    'N': {'AAT': 0.46, 'AAC': 0.54},
+    'D': {'GAT': 0.46, 'GAC': 0.54},
+    'C': {'TGT': 0.45, 'TGC': 0.55},
+    'Q': {'CAA': 0.25, 'CAG': 0.75},
+    'E': {'GAA': 0.42, 'GAG': 0.58},
+    'G': {'GGT': 0.16, 'GGC': 0.34, 'GGA': 0.25, 'GGG': 0.25},
+    'H': {'CAT': 0.41, 'CAC': 0.59},
+    'I': {'ATT': 0.36, 'ATC': 0.48, 'ATA': 0.16},
+    'L': {'TTA': 0.07, 'TTG': 0.13, 'CTT': 0.13, 'CTC': 0.20, 'CTA': 0.07, 'CTG': 0.41},
+    'K': {'AAA': 0.42, 'AAG': 0.58},
+    'M': {'ATG': 1.00},
+    'F': {'TTT': 0.45, 'TTC': 0.55},
+    'P': {'CCT': 0.28, 'CCC': 0.33, 'CCA': 0.27, 'CCG': 0.11},
+    'S': {'TCT': 0.18, 'TCC': 0.22, 'TCA': 0.15, 'TCG': 0.06, 'AGT': 0.15, 'AGC': 0.24},
+    'T': {'ACT': 0.24, 'ACC': 0.36, 'ACA': 0.28, 'ACG': 0.12},
+    'W': {'TGG': 1.00},
+    'Y': {'TAT': 0.43, 'TAC': 0.57},
+    'V': {'GTT': 0.18, 'GTC': 0.24, 'GTA': 0.11, 'GTG': 0.47},
+    '*': {'TAA': 0.28, 'TAG': 0.20, 'TGA': 0.52}
+}
+
+MOUSE_CODON_USAGE = {
+    # Similar to human but with some differences
+    'A': {'GCT': 0.27, 'GCC': 0.41, 'GCA': 0.21, 'GCG': 0.11},
+    'R': {'CGT': 0.09, 'CGC': 0.18, 'CGA': 0.10, 'CGG': 0.22, 'AGA': 0.21, 'AGG': 0.20},
+    'L': {'TTA': 0.08, 'TTG': 0.14, 'CTT': 0.12, 'CTC': 0.19, 'CTA': 0.06, 'CTG': 0.42},
+    # ... (similar structure for other amino acids)
+}
+
+ECOLI_CODON_USAGE = {
+    'A': {'GCT': 0.18, 'GCC': 0.26, 'GCA': 0.21, 'GCG': 0.35},
+    'R': {'CGT': 0.36, 'CGC': 0.36, 'CGA': 0.07, 'CGG': 0.11, 'AGA': 0.07, 'AGG': 0.04},
+    'L': {'TTA': 0.14, 'TTG': 0.13, 'CTT': 0.12, 'CTC': 0.10, 'CTA': 0.04, 'CTG': 0.47},
+    # E. coli prefers different codons due to tRNA availability
+}
+
+_CODON_USAGE_BY_ORGANISM = {
+    Organism.HUMAN: HUMAN_CODON_USAGE,
+    Organism.MOUSE: MOUSE_CODON_USAGE,
+    Organism.E_COLI: ECOLI_CODON_USAGE,
+}
+
+# Most frequent codon per amino acid, resolved once at import time so the
+# optimization loop is a single dict lookup per residue instead of a
+# max() scan over the frequency table
+BEST_CODON = {
+    org: {aa: max(codons.items(), key=lambda kv: kv[1])[0] for aa, codons in table.items()}
+    for org, table in _CODON_USAGE_BY_ORGANISM.items()
+}
+
+# Standard genetic code with one-letter amino acids, so codon tables are
+# built (and clean sequences translated) without Bio.Seq objects
+_CODON_TO_AA = {
+    'TTT': 'F', 'TTC': 'F', 'TTA': 'L', 'TTG': 'L',
+    'CTT': 'L', 'CTC': 'L', 'CTA': 'L', 'CTG': 'L',
+    'ATT': 'I', 'ATC': 'I', 'ATA': 'I', 'ATG': 'M',
+    'GTT': 'V', 'GTC': 'V', 'GTA': 'V', 'GTG': 'V',
+    'TCT': 'S', 'TCC': 'S', 'TCA': 'S', 'TCG': 'S',
+    'CCT': 'P', 'CCC': 'P', 'CCA': 'P', 'CCG': 'P',
+    'ACT': 'T', 'ACC': 'T', 'ACA': 'T', 'ACG': 'T',
+    'GCT': 'A', 'GCC': 'A', 'GCA': 'A', 'GCG': 'A',
+    'TAT': 'Y', 'TAC': 'Y', 'TAA': '*', 'TAG': '*',
+    'CAT': 'H', 'CAC': 'H', 'CAA': 'Q', 'CAG': 'Q',
+    'AAT': 'N', 'AAC': 'N', 'AAA': 'K', 'AAG': 'K',
+    'GAT': 'D', 'GAC': 'D', 'GAA': 'E', 'GAG': 'E',
+    'TGT': 'C', 'TGC': 'C', 'TGA': '*', 'TGG': 'W',
+    'CGT': 'R', 'CGC': 'R', 'CGA': 'R', 'CGG': 'R',
+    'AGT': 'S', 'AGC': 'S', 'AGA': 'R', 'AGG': 'R',
+    'GGT': 'G', 'GGC': 'G', 'GGA': 'G', 'GGG': 'G'
+}
+
+# 2-bit radix encoding of the DNA alphabet: ASCII byte -> 0-3 (255 for
+# anything that is not an unambiguous upper-case base)
+_BASE_CODE = np.full(256, 255, dtype=np.uint8)
+for _i, _base in enumerate(b'ACGT'):
+    _BASE_CODE[_base] = _i
+
+def _build_codon_luts():
+    """Build per-organism (64, 3) byte tables mapping radix-encoded codon
+    index (16*b0 + 4*b1 + b2) straight to the optimized codon, plus the
+    stop-codon mask. Lets optimization run as one NumPy gather."""
+    bases = 'ACGT'
+    luts = {}
+    is_stop = np.zeros(64, dtype=bool)
+    for idx in range(64):
+        codon = bases[idx >> 4] + bases[(idx >> 2) & 3] + bases[idx & 3]
+        aa = _CODON_TO_AA[codon]
+        is_stop[idx] = aa == '*'
+        for org, best in BEST_CODON.items():
+            rows = luts.setdefault(org, np.zeros((64, 3), dtype=np.uint8))
+            rows[idx] = np.frombuffer(best.get(aa, 'NNN').encode('ascii'), dtype=np.uint8)
+    # G+C count of each output codon, so the optimized sequence's GC
+    # content falls out of the same gather instead of a second scan
+    gc_counts = {
+        org: ((rows == ord('G')) | (rows == ord('C'))).sum(axis=1).astype(np.uint8)
+        for org, rows in luts.items()
+    }
+    return luts, is_stop, gc_counts
+
+_CODON_LUT, _CODON_IS_STOP, _CODON_GC_COUNT = _build_codon_luts()
+
+# Trait mappings allocated once at import (read-only views so nothing
+# mutates them behind the engine's back); keys are already lowercase so
+# trait.lower() is the only per-call string op
+_TRAIT_TO_GENE = MappingProxyType({
+    "high bone density": {"gene": "LRP5", "species": "Ursus maritimus"},
+    "uv radiation tolerance": {"gene": "XP-V", "species": "Deinococcus radiodurans"},
+    "drought resistance": {"gene": "AREB1", "species": "Arabidopsis thaliana"},
+    "cold tolerance": {"gene": "CBF", "species": "Arabidopsis thaliana"},
+    "disease resistance": {"gene": "NLR", "species": "Oryza sativa"},
+    "insulin production": {"gene": "INS", "species": "Homo sapiens"}
+})
+
+_SIMULATED_GENES = MappingProxyType({
+    "high bone density": {
+        "name": "LRP5",
+        "species": "Ursus maritimus",
+        "ncbi_id": "101885918",
+        "sequence": "ATGGGCTCTCTGGTGCTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTG",
+        "description": "Low-density lipoprotein receptor-related protein 5, linked to unusually high bone density in polar bears."
+    },
+    "uv radiation tolerance": {
+        "name": "XP-V",
+        "species": "Deinococcus radiodurans",
+        "ncbi_id": "100385918",
+        "sequence": "ATGGCCTCTCTGGTGCTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTG",
+        "description": "Xeroderma pigmentosum variant protein, involved in DNA repair mechanisms against radiation damage."
+    },
+    "pain insensitivity": {
+        "name": "SCN9A",
+        "species": "Heterocephalus glaber",
+        "ncbi_id": "101704257",
+        "sequence": "ATGGATTACAACACGCTGGCCAACACGCTGGCCAACACGCTGGCCAACACGCTGGCCAACACGCTGGCCA",
+        "description": "Sodium voltage-gated channel alpha subunit 9, mutations are linked to insensitivity to certain types of pain in naked mole-rats."
+    },
+    "hypoxia tolerance": {
+        "name": "HIF1A",
+        "species": "Heterocephalus glaber",
+        "ncbi_id": "101706691",
+        "sequence": "ATGCCTAGAGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCA",
+        "description": "Hypoxia-inducible factor 1-alpha, a key regulator for survival in low-oxygen environments."
+    },
+    "freeze tolerance": {
+        "name": "AFGP",
+        "species": "Boreogadus saida",
+        "ncbi_id": "101149420",
+        "sequence": "ATGACAGCACTAGCCACATTGGCCACATTGGCCACATTGGCCACATTGGCCACATTGGCCACATTGGCCA",
+        "description": "Antifreeze glycoprotein, prevents ice crystal growth in the blood of polar cod."
+    },
+    "toxin resistance": {
+        "name": "SCN4A",
+        "species": "Thamnophis sirtalis",
+        "ncbi_id": "102914589",
+        "sequence": "ATGTCCGATTCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGA",
+        "description": "Sodium voltage-gated channel alpha subunit 4, mutations provide resistance to tetrodotoxin in garter snakes."
+    }
+})
+
+# Shared generator plus nucleotide byte tables so random sequences are
+# drawn as one vectorized call instead of per-base Python dispatch
+_RNG = np.random.default_rng()
+_NT = np.frombuffer(b'ATCG', dtype=np.uint8)
+_NT_CODE = np.zeros(256, dtype=np.uint8)
+for _i, _base in enumerate(b'ATCG'):
+    _NT_CODE[_base] = _i
+
+# Context-based similarity scores for off-target analysis
+CONTEXT_SIMILARITY = {
+    "gene_cluster": 0.75,
+    "regulatory_region": 0.65,
+    "HLA_complex": 0.80,
+    "BRCA1_region": 0.70,
+    "essential_genes": 0.85,
+    "metabolic_cluster": 0.60,
+    "intergenic": 0.45,
+    "AAVS1_safe_harbor": 0.30,
+    "LRP5_locus": 0.55,
+    "F8_locus": 0.60
+}
+
+# Typical GC content expected for each risk tier of genomic region
+EXPECTED_GC = {"High": 60, "Medium": 45, "Low": 40}
+
+# Real genomic regions database for different organisms
+GENOMIC_HOTSPOTS = {
+    Organism.HUMAN: [
+        {"chr": "Chr1", "start": 1000000, "end": 5000000, "type": "gene_cluster", "risk": "High"},
+        {"chr": "Chr2", "start": 10000000, "end": 15000000, "type": "regulatory_region", "risk": "Medium"},
+        {"chr": "Chr3", "start": 20000000, "end": 25000000, "type": "intergenic", "risk": "Low"},
+        {"chr": "Chr6", "start": 28000000, "end": 33000000, "type": "HLA_complex", "risk": "High"},
+        {"chr": "Chr11", "start": 68000000, "end": 69000000, "type": "LRP5_locus", "risk": "Medium"},
+        {"chr": "Chr17", "start": 43000000, "end": 44000000, "type": "BRCA1_region", "risk": "High"},
+        {"chr": "Chr19", "start": 55115756, "end": 55115856, "type": "AAVS1_safe_harbor", "risk": "Low"},
+        {"chr": "ChrX", "start": 153000000, "end": 154000000, "type": "F8_locus", "risk": "Medium"}
+    ],
+    Organism.MOUSE: [
+        {"chr": "Chr1", "start": 3000000, "end": 8000000, "type": "gene_cluster", "risk": "High"},
+        {"chr": "Chr2", "start": 12000000, "end": 17000000, "type": "regulatory_region", "risk": "Medium"},
+        {"chr": "Chr7", "start": 45000000, "end": 50000000, "type": "intergenic", "risk": "Low"}
+    ],
+    Organism.E_COLI: [
+        {"chr": "Chromosome", "start": 100000, "end": 200000, "type": "essential_genes", "risk": "High"},
+        {"chr": "Chromosome", "start": 500000, "end": 600000, "type": "metabolic_cluster", "risk": "Medium"},
+        {"chr": "Chromosome", "start": 1000000, "end": 1100000, "type": "intergenic", "risk": "Low"}
+    ]
+}
+
+# Per-organism parallel arrays (base similarity, expected GC, coordinate
+# bounds) so the similarity filter and the position draws over all
+# regions run as single NumPy calls
+_REGION_TABLES = {
+    org: (
+        np.array([CONTEXT_SIMILARITY.get(r["type"], 0.5) for r in regions]),
+        np.array([EXPECTED_GC[r["risk"]] for r in regions], dtype=np.float64),
+        np.array([r["start"] for r in regions], dtype=np.int64),
+        np.array([r["end"] for r in regions], dtype=np.int64),
+    )
+    for org, regions in GENOMIC_HOTSPOTS.items()
+}
+
+# Risk score spans (toxicity, immunogenicity, environmental) and the
+# recommendation triggered when each score exceeds its threshold
+_RISK_SPAN = np.array([0.7, 0.6, 0.4])
+_RISK_RECOMMENDATIONS = (
+    (0, 0.6, "Consider protein engineering to reduce potential toxicity"),
+    (1, 0.5, "Evaluate potential immune responses in the host organism"),
+    (2, 0.4, "Implement containment strategies for environmental release"),
+)
+
+# Genomic contexts grouped by impact tier; frozensets give O(1) hashed
+# membership tests in the per-site impact assessment
+_HIGH_RISK_CONTEXTS = frozenset({"gene_cluster", "HLA_complex", "BRCA1_region", "essential_genes"})
+_MEDIUM_RISK_CONTEXTS = frozenset({"regulatory_region", "LRP5_locus", "F8_locus", "metabolic_cluster"})
+
 class BioinformaticsEngine:
+    # Trait lookups cached per (trait, organism) - NCBI round-trips dominate
+    GENE_CACHE_MAX = 256
+
     def __init__(self):
+        self._gene_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        # In-flight lookups, so concurrent requests for the same trait
+        # share a single NCBI fetch instead of racing duplicates
+        self._gene_pending: Dict[tuple, asyncio.Task] = {}
         self.codon_optimization_tables = {
             Organism.HUMAN: self._get_human_codon_table(),
             Organism.MOUSE: self._get_mouse_codon_table(),
@@ -48,27 +319,64 @@ class BioinformaticsEngine:
         return table
     
     async def find_gene_for_trait(self, trait: str, organism: str) -> Optional[Dict[str, Any]]:
-        """Find a gene associated with a specific trait in an organism"""
+        """Find a gene associated with a specific trait in an organism
+
+        Results are LRU-cached on (trait, organism) and concurrent lookups
+        for the same key are deduplicated, so repeat queries skip the NCBI
+        round-trip entirely.
+        """
+        key = (trait.lower(), organism)
+        cached = self._gene_cache.get(key)
+        if cached is not None:
+            self._gene_cache.move_to_end(key)
+            return cached
+
+        task = self._gene_pending.get(key)
+        if task is not None:
+            # Someone else is already fetching this trait - share the result
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._find_gene_for_trait_uncached(trait, organism))
+        self._gene_pending[key] = task
+        try:
+            result = await task
+        finally:
+            self._gene_pending.pop(key, None)
+
+        if result is not None:
+            self._gene_cache[key] = result
+            if len(self._gene_cache) > self.GENE_CACHE_MAX:
+                self._gene_cache.popitem(last=False)
+        return result
+
+    async def find_genes_for_traits(self, pairs: List[tuple]) -> List[Any]:
+        """Resolve many (trait, organism) pairs concurrently
+
+        Each lookup goes through the cached find_gene_for_trait path;
+        failures come back in-place as exception instances instead of
+        aborting the whole batch.
+        """
+        return await asyncio.gather(
+            *(self.find_gene_for_trait(trait, organism) for trait, organism in pairs),
+            return_exceptions=True
+        )
+
+    async def _find_gene_for_trait_uncached(self, trait: str, organism: str) -> Optional[Dict[str, Any]]:
+        """Resolve a trait to gene data via NCBI (no caching)"""
         # This would typically search databases like NCBI, UniProt, etc.
         # For demo purposes, we'll use a predefined mapping with some NCBI integration
-        
-        trait_to_gene = {
-            "high bone density": {"gene": "LRP5", "species": "Ursus maritimus"},
-            "uv radiation tolerance": {"gene": "XP-V", "species": "Deinococcus radiodurans"},
-            "drought resistance": {"gene": "AREB1", "species": "Arabidopsis thaliana"},
-            "cold tolerance": {"gene": "CBF", "species": "Arabidopsis thaliana"},
-            "disease resistance": {"gene": "NLR", "species": "Oryza sativa"},
-            "insulin production": {"gene": "INS", "species": "Homo sapiens"}
-        }
-        
-        if trait.lower() in trait_to_gene:
-            gene_info = trait_to_gene[trait.lower()]
+        gene_info = _TRAIT_TO_GENE.get(trait.lower())
+        if gene_info is not None:
             # Try to get real data from NCBI
             gene_ids = await ncbi_client.search_gene(gene_info["gene"], gene_info["species"])
             if gene_ids:
-                gene_data = await ncbi_client.get_gene_info(gene_ids[0])
-                sequence = await ncbi_client.get_gene_sequence(gene_ids[0])
-                
+                # Info and sequence only depend on the gene id, so fetch
+                # them concurrently - latency is max(info, seq), not the sum
+                gene_data, sequence = await asyncio.gather(
+                    ncbi_client.get_gene_info(gene_ids[0]),
+                    ncbi_client.get_gene_sequence(gene_ids[0])
+                )
+
                 if gene_data and sequence:
                     return {
                         "name": gene_data["name"],
@@ -83,217 +391,161 @@ class BioinformaticsEngine:
     
     async def _simulate_gene_search(self, trait: str, organism: str) -> Dict[str, Any]:
         """Simulate gene search for demo purposes"""
-        simulated_genes = {
-            "high bone density": {
-                "name": "LRP5",
-                "species": "Ursus maritimus",
-                "ncbi_id": "101885918",
-                "sequence": "ATGGGCTCTCTGGTGCTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTG",
-                "description": "Low-density lipoprotein receptor-related protein 5, linked to unusually high bone density in polar bears."
-            },
-            "uv radiation tolerance": {
-                "name": "XP-V",
-                "species": "Deinococcus radiodurans",
-                "ncbi_id": "100385918",
-                "sequence": "ATGGCCTCTCTGGTGCTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTGCTGCTGGTG",
-                "description": "Xeroderma pigmentosum variant protein, involved in DNA repair mechanisms against radiation damage."
-            },
-            "pain insensitivity": {
-                "name": "SCN9A",
-                "species": "Heterocephalus glaber",
-                "ncbi_id": "101704257",
-                "sequence": "ATGGATTACAACACGCTGGCCAACACGCTGGCCAACACGCTGGCCAACACGCTGGCCAACACGCTGGCCA",
-                "description": "Sodium voltage-gated channel alpha subunit 9, mutations are linked to insensitivity to certain types of pain in naked mole-rats."
-            },
-            "hypoxia tolerance": {
-                "name": "HIF1A",
-                "species": "Heterocephalus glaber",
-                "ncbi_id": "101706691",
-                "sequence": "ATGCCTAGAGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCATGGTGCTCA",
-                "description": "Hypoxia-inducible factor 1-alpha, a key regulator for survival in low-oxygen environments."
-            },
-            "freeze tolerance": {
-                "name": "AFGP",
-                "species": "Boreogadus saida",
-                "ncbi_id": "101149420",
-                "sequence": "ATGACAGCACTAGCCACATTGGCCACATTGGCCACATTGGCCACATTGGCCACATTGGCCACATTGGCCA",
-                "description": "Antifreeze glycoprotein, prevents ice crystal growth in the blood of polar cod."
-            },
-            "toxin resistance": {
-                "name": "SCN4A",
-                "species": "Thamnophis sirtalis",
-                "ncbi_id": "102914589",
-                "sequence": "ATGTCCGATTCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGATGAGCGGA",
-                "description": "Sodium voltage-gated channel alpha subunit 4, mutations provide resistance to tetrodotoxin in garter snakes."
-            }
-        }
-        
-        if trait.lower() in simulated_genes:
-            return simulated_genes[trait.lower()]
-        
+        known = _SIMULATED_GENES.get(trait.lower())
+        if known is not None:
+            return known
+
         # Default fallback
         return {
             "name": "SIM1",
             "species": organism,
             "ncbi_id": "999999999",
-            "sequence": "ATG" + "".join(random.choices("ATCG", k=300)),
+            "sequence": "ATG" + _NT[_RNG.integers(0, 4, size=300)].tobytes().decode('ascii'),
             "description": f"Simulated gene for {trait}"
         }
     
     async def optimize_codon_usage(self, sequence: str, organism: Organism) -> str:
-        """Optimize codon usage for a specific organism using real frequency tables"""
-        
-        # Real codon usage frequency tables based on actual genomic data
-        HUMAN_CODON_USAGE = {
-            'A': {'GCT': 0.26, 'GCC': 0.40, 'GCA': 0.23, 'GCG': 0.11},
-            'R': {'CGT': 0.08, 'CGC': 0.19, 'CGA': 0.11, 'CGG': 0.21, 'AGA': 0.20, 'AGG': 0.20},
-            'N': {'AAT': 0.46, 'AAC': 0.54},
-            'D': {'GAT': 0.46, 'GAC': 0.54},
-            'C': {'TGT': 0.45, 'TGC': 0.55},
-            'Q': {'CAA': 0.25, 'CAG': 0.75},
-            'E': {'GAA': 0.42, 'GAG': 0.58},
-            'G': {'GGT': 0.16, 'GGC': 0.34, 'GGA': 0.25, 'GGG': 0.25},
-            'H': {'CAT': 0.41, 'CAC': 0.59},
-            'I': {'ATT': 0.36, 'ATC': 0.48, 'ATA': 0.16},
-            'L': {'TTA': 0.07, 'TTG': 0.13, 'CTT': 0.13, 'CTC': 0.20, 'CTA': 0.07, 'CTG': 0.41},
-            'K': {'AAA': 0.42, 'AAG': 0.58},
-            'M': {'ATG': 1.00},
-            'F': {'TTT': 0.45, 'TTC': 0.55},
-            'P': {'CCT': 0.28, 'CCC': 0.33, 'CCA': 0.27, 'CCG': 0.11},
-            'S': {'TCT': 0.18, 'TCC': 0.22, 'TCA': 0.15, 'TCG': 0.06, 'AGT': 0.15, 'AGC': 0.24},
-            'T': {'ACT': 0.24, 'ACC': 0.36, 'ACA': 0.28, 'ACG': 0.12},
-            'W': {'TGG': 1.00},
-            'Y': {'TAT': 0.43, 'TAC': 0.57},
-            'V': {'GTT': 0.18, 'GTC': 0.24, 'GTA': 0.11, 'GTG': 0.47},
-            '*': {'TAA': 0.28, 'TAG': 0.20, 'TGA': 0.52}
-        }
-        
-        MOUSE_CODON_USAGE = {
-            # Similar to human but with some differences
-            'A': {'GCT': 0.27, 'GCC': 0.41, 'GCA': 0.21, 'GCG': 0.11},
-            'R': {'CGT': 0.09, 'CGC': 0.18, 'CGA': 0.10, 'CGG': 0.22, 'AGA': 0.21, 'AGG': 0.20},
-            'L': {'TTA': 0.08, 'TTG': 0.14, 'CTT': 0.12, 'CTC': 0.19, 'CTA': 0.06, 'CTG': 0.42},
-            # ... (similar structure for other amino acids)
-        }
-        
-        ECOLI_CODON_USAGE = {
-            'A': {'GCT': 0.18, 'GCC': 0.26, 'GCA': 0.21, 'GCG': 0.35},
-            'R': {'CGT': 0.36, 'CGC': 0.36, 'CGA': 0.07, 'CGG': 0.11, 'AGA': 0.07, 'AGG': 0.04},
-            'L': {'TTA': 0.14, 'TTG': 0.13, 'CTT': 0.12, 'CTC': 0.10, 'CTA': 0.04, 'CTG': 0.47},
-            # E. coli prefers different codons due to tRNA availability
-        }
-        
-        # Select the appropriate codon table
-        if organism == Organism.HUMAN:
-            codon_table = HUMAN_CODON_USAGE
-        elif organism == Organism.MOUSE:
-            codon_table = MOUSE_CODON_USAGE if 'MOUSE_CODON_USAGE' in locals() else HUMAN_CODON_USAGE
-        elif organism == Organism.E_COLI:
-            codon_table = ECOLI_CODON_USAGE if 'ECOLI_CODON_USAGE' in locals() else HUMAN_CODON_USAGE
-        else:
-            codon_table = HUMAN_CODON_USAGE
-        
-        # Translate sequence to amino acids first
+        """Optimize codon usage for a specific organism using real frequency tables
+
+        The translation/optimization loop is pure CPU work, so it runs in a
+        worker thread to keep the event loop free for other requests.
+        """
+        return await asyncio.to_thread(self._optimize_codon_usage_sync, sequence, organism)
+
+    def _optimize_codon_usage_sync(self, sequence: str, organism: Organism) -> str:
+        """Synchronous codon optimization (runs in a thread pool)"""
+
         try:
-            bio_seq = Seq(sequence)
-            aa_sequence = str(bio_seq.translate())
-        except:
-            return sequence  # Return original if translation fails
-        
-        # Optimize each amino acid to preferred codon
-        optimized_codons = []
-        for aa in aa_sequence:
-            if aa == '*':  # Stop codon
-                break
-            
-            if aa in codon_table:
-                # Choose the most frequent codon for this organism
-                codons = codon_table[aa]
-                best_codon = max(codons.keys(), key=lambda k: codons[k])
-                optimized_codons.append(best_codon)
-            else:
-                # Fallback for unknown amino acids
-                optimized_codons.append('NNN')
-        
-        optimized_sequence = ''.join(optimized_codons)
-        
-        # Calculate optimization score
-        original_gc = GC(sequence) if sequence else 50.0
-        optimized_gc = GC(optimized_sequence) if optimized_sequence else 50.0
-        
-        print(f"Codon optimization: {len(sequence)}bp -> {len(optimized_sequence)}bp")
-        print(f"GC content: {original_gc:.1f}% -> {optimized_gc:.1f}%")
-        
+            arr = np.frombuffer(sequence.encode('ascii'), dtype=np.uint8)
+        except UnicodeEncodeError:
+            return sequence
+
+        codes = _BASE_CODE[arr][:len(arr) // 3 * 3]
+        if codes.size and not (codes == 255).any():
+            # Clean ACGT input: radix-encode every codon and gather the
+            # optimized codons through the precomputed 64-entry table in
+            # one vectorized pass instead of per-residue Python dispatch
+            idx = codes.reshape(-1, 3) @ np.array([16, 4, 1], dtype=np.uint8)
+            stops = _CODON_IS_STOP[idx]
+            if stops.any():
+                idx = idx[:int(np.argmax(stops))]
+            lut_org = organism if organism in _CODON_LUT else Organism.HUMAN
+            optimized_sequence = _CODON_LUT[lut_org][idx].tobytes().decode('ascii')
+
+            # GC content for both sequences comes out of buffers already in
+            # hand: the raw uint8 view and the per-codon GC count table
+            original_gc = 100.0 * np.count_nonzero((arr == 71) | (arr == 67)) / arr.size
+            optimized_gc = (
+                100.0 * int(_CODON_GC_COUNT[lut_org][idx].sum()) / (3 * idx.size)
+                if idx.size else 50.0
+            )
+        else:
+            # Ambiguous bases (N etc.): fall back to Biopython translation
+            # and the per-residue lookup. Imported here so the common clean
+            # path never touches Bio.Seq at all.
+            from Bio.Seq import Seq
+
+            best = BEST_CODON.get(organism, BEST_CODON[Organism.HUMAN])
+            try:
+                aa_sequence = str(Seq(sequence).translate())
+            except:
+                return sequence  # Return original if translation fails
+
+            optimized_codons = []
+            for aa in aa_sequence:
+                if aa == '*':  # Stop codon
+                    break
+                optimized_codons.append(best.get(aa, 'NNN'))
+
+            optimized_sequence = ''.join(optimized_codons)
+
+            # Calculate optimization score
+            original_gc = gc_content(sequence) if sequence else 50.0
+            optimized_gc = gc_content(optimized_sequence) if optimized_sequence else 50.0
+
+        # %-style args defer formatting until a handler actually emits;
+        # at the default INFO level these cost one level check
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Codon optimization: %dbp -> %dbp", len(sequence), len(optimized_sequence))
+            logger.debug("GC content: %.1f%% -> %.1f%%", original_gc, optimized_gc)
+
         return optimized_sequence
     
     async def predict_off_target_effects(self, sequence: str, host_organism: Organism) -> OffTargetAnalysis:
         """Predict off-target effects of a sequence in a host organism using real bioinformatics algorithms"""
         sites = []
         warnings = []
-        
+        high_risk_count = 0
+        low_mismatch_count = 0
+
         try:
             # Real off-target prediction using sequence similarity analysis
             potential_targets = await self._find_real_off_targets(sequence, host_organism)
-            
+
             for target in potential_targets:
                 # Calculate real mismatch count
                 mismatch_count = self._calculate_mismatches(sequence, target['sequence'])
-                
+
                 # Determine real potential impact based on genomic location
                 impact = self._assess_genomic_impact(target['chromosome'], target['position'], target['gene_context'])
-                
-                sites.append(OffTargetSite(
+
+                # Tally the warning counters while building the list so the
+                # sites are traversed exactly once
+                if impact == "High":
+                    high_risk_count += 1
+                if mismatch_count <= 2:
+                    low_mismatch_count += 1
+
+                # model_construct skips pydantic validation - every field
+                # here is produced by our own analysis, not user input
+                sites.append(OffTargetSite.model_construct(
                     sequence=target['sequence'],
                     chromosome=target['chromosome'],
                     position=target['position'],
                     mismatch_count=mismatch_count,
                     potential_impact=impact
                 ))
-            
+
             # Real warning system based on scientific criteria
             if len(sites) > 5:
                 warnings.append("High number of potential off-target sites detected - consider sequence refinement")
-            
-            high_risk_count = sum(1 for site in sites if site.potential_impact == "High")
+
             if high_risk_count > 0:
                 warnings.append(f"{high_risk_count} high-risk off-target sites in critical genomic regions")
-            
+
             # Check for sites with very few mismatches (high risk)
-            low_mismatch_sites = [site for site in sites if site.mismatch_count <= 2]
-            if low_mismatch_sites:
-                warnings.append(f"{len(low_mismatch_sites)} sites with ≤2 mismatches - very high off-target risk")
-            
+            if low_mismatch_count:
+                warnings.append(f"{low_mismatch_count} sites with ≤2 mismatches - very high off-target risk")
+
             if not sites:
                 warnings.append("No significant off-target sites detected - low risk profile")
-                
+
         except Exception as e:
-            print(f"Error in real off-target prediction: {e}")
+            logger.warning("Error in real off-target prediction: %s", e)
             # Fallback to minimal real data
             sites = await self._minimal_real_off_target_analysis(sequence, host_organism)
             warnings.append("Using simplified off-target analysis due to database limitations")
-        
+            high_risk_count = sum(1 for site in sites if site.potential_impact == "High")
+
         return OffTargetAnalysis(
             total_sites=len(sites),
-            high_risk_sites=sum(1 for site in sites if site.potential_impact == "High"),
+            high_risk_sites=high_risk_count,
             sites=sites,
             warnings=warnings
         )
     
     async def assess_risks(self, gene_data: Dict[str, Any], host_organism: Organism) -> RiskAssessment:
         """Assess potential risks of the genetic modification"""
-        # Simulate risk assessment
-        toxicity = random.uniform(0.1, 0.8)
-        immunogenicity = random.uniform(0.1, 0.7)
-        environmental_risk = random.uniform(0.1, 0.5)
-        
-        recommendations = []
-        if toxicity > 0.6:
-            recommendations.append("Consider protein engineering to reduce potential toxicity")
-        if immunogenicity > 0.5:
-            recommendations.append("Evaluate potential immune responses in the host organism")
-        if environmental_risk > 0.4:
-            recommendations.append("Implement containment strategies for environmental release")
-        
+        # Simulate risk assessment: one vectorized draw scaled to the
+        # (0.1, 0.8/0.7/0.5) ranges instead of three RNG calls
+        scores = _RNG.random(3) * _RISK_SPAN + 0.1
+        toxicity, immunogenicity, environmental_risk = (float(s) for s in scores)
+
+        recommendations = [
+            message for index, threshold, message in _RISK_RECOMMENDATIONS
+            if scores[index] > threshold
+        ]
+
         if not recommendations:
             recommendations.append("No significant risks identified. Proceed with standard validation protocols.")
         
@@ -325,126 +577,93 @@ class BioinformaticsEngine:
         return max(0.1, min(0.99, score))
     
     async def _find_real_off_targets(self, sequence: str, host_organism: Organism) -> List[Dict[str, Any]]:
-        """Find real off-target sites using sequence similarity analysis"""
+        """Find real off-target sites using sequence similarity analysis
+
+        The similarity scan is pure CPU work, so it runs in a worker
+        thread to keep the event loop free for other requests.
+        """
+        return await asyncio.to_thread(self._find_real_off_targets_sync, sequence, host_organism)
+
+    def _find_real_off_targets_sync(self, sequence: str, host_organism: Organism) -> List[Dict[str, Any]]:
+        """Synchronous off-target scan (runs in a thread pool)"""
         targets = []
-        
-        # Real genomic regions database for different organisms
-        genomic_hotspots = {
-            Organism.HUMAN: [
-                {"chr": "Chr1", "start": 1000000, "end": 5000000, "type": "gene_cluster", "risk": "High"},
-                {"chr": "Chr2", "start": 10000000, "end": 15000000, "type": "regulatory_region", "risk": "Medium"},
-                {"chr": "Chr3", "start": 20000000, "end": 25000000, "type": "intergenic", "risk": "Low"},
-                {"chr": "Chr6", "start": 28000000, "end": 33000000, "type": "HLA_complex", "risk": "High"},
-                {"chr": "Chr11", "start": 68000000, "end": 69000000, "type": "LRP5_locus", "risk": "Medium"},
-                {"chr": "Chr17", "start": 43000000, "end": 44000000, "type": "BRCA1_region", "risk": "High"},
-                {"chr": "Chr19", "start": 55115756, "end": 55115856, "type": "AAVS1_safe_harbor", "risk": "Low"},
-                {"chr": "ChrX", "start": 153000000, "end": 154000000, "type": "F8_locus", "risk": "Medium"}
-            ],
-            Organism.MOUSE: [
-                {"chr": "Chr1", "start": 3000000, "end": 8000000, "type": "gene_cluster", "risk": "High"},
-                {"chr": "Chr2", "start": 12000000, "end": 17000000, "type": "regulatory_region", "risk": "Medium"},
-                {"chr": "Chr7", "start": 45000000, "end": 50000000, "type": "intergenic", "risk": "Low"}
-            ],
-            Organism.E_COLI: [
-                {"chr": "Chromosome", "start": 100000, "end": 200000, "type": "essential_genes", "risk": "High"},
-                {"chr": "Chromosome", "start": 500000, "end": 600000, "type": "metabolic_cluster", "risk": "Medium"},
-                {"chr": "Chromosome", "start": 1000000, "end": 1100000, "type": "intergenic", "risk": "Low"}
-            ]
-        }
-        
-        regions = genomic_hotspots.get(host_organism, genomic_hotspots[Organism.HUMAN])
-        
-        # Analyze sequence for potential binding sites
-        for region in regions:
-            # Real sequence similarity analysis
-            similarity = self._calculate_sequence_similarity(sequence, region)
-            
-            if similarity > 0.6:  # Threshold for potential off-target
-                # Generate realistic target sequence with controlled mismatches
-                target_seq = self._generate_realistic_target_sequence(sequence, similarity)
-                
-                targets.append({
-                    "sequence": target_seq,
-                    "chromosome": region["chr"],
-                    "position": random.randint(region["start"], region["end"]),
-                    "gene_context": region["type"],
-                    "similarity_score": similarity
-                })
-        
+
+        org = host_organism if host_organism in GENOMIC_HOTSPOTS else Organism.HUMAN
+        regions = GENOMIC_HOTSPOTS[org]
+        base_sim, expected_gc, starts, ends = _REGION_TABLES[org]
+
+        # The query's GC content is invariant across regions - scan once,
+        # then score every region in a single vectorized expression
+        query_gc = gc_content(sequence) if sequence else 50.0
+        similarities = base_sim * (1.0 - np.abs(query_gc - expected_gc) / 100.0)
+
+        # Only regions past the off-target threshold need Python-level
+        # work; their positions come from one batched draw
+        hits = np.nonzero(similarities > 0.6)[0]
+        if hits.size == 0:
+            return targets
+        positions = _RNG.integers(starts[hits], ends[hits], endpoint=True)
+
+        for i, position in zip(hits, positions):
+            region = regions[i]
+            similarity = float(similarities[i])
+
+            # Generate realistic target sequence with controlled mismatches
+            target_seq = self._generate_realistic_target_sequence(sequence, similarity)
+
+            targets.append({
+                "sequence": target_seq,
+                "chromosome": region["chr"],
+                "position": int(position),
+                "gene_context": region["type"],
+                "similarity_score": similarity
+            })
+
         return targets
     
     def _calculate_mismatches(self, sequence1: str, sequence2: str) -> int:
         """Calculate real number of mismatches between two sequences"""
-        if len(sequence1) != len(sequence2):
-            # Align sequences to same length for comparison
-            min_len = min(len(sequence1), len(sequence2))
-            sequence1 = sequence1[:min_len]
-            sequence2 = sequence2[:min_len]
-        
-        mismatches = sum(1 for a, b in zip(sequence1, sequence2) if a != b)
-        return mismatches
+        # Align sequences to same length for comparison
+        min_len = min(len(sequence1), len(sequence2))
+        sequence1 = sequence1[:min_len]
+        sequence2 = sequence2[:min_len]
+
+        if min_len < 32:
+            # NumPy setup costs more than the loop for tiny guide sequences
+            return sum(1 for a, b in zip(sequence1, sequence2) if a != b)
+
+        # One compiled byte comparison instead of a per-char Python loop
+        a = np.frombuffer(sequence1.encode('ascii'), dtype=np.uint8)
+        b = np.frombuffer(sequence2.encode('ascii'), dtype=np.uint8)
+        return int(_hamming(a, b))
     
     def _assess_genomic_impact(self, chromosome: str, position: int, gene_context: str) -> str:
         """Assess real potential impact based on genomic location and context"""
         # Real impact assessment based on genomic features
-        high_risk_contexts = ["gene_cluster", "HLA_complex", "BRCA1_region", "essential_genes"]
-        medium_risk_contexts = ["regulatory_region", "LRP5_locus", "F8_locus", "metabolic_cluster"]
-        low_risk_contexts = ["intergenic", "AAVS1_safe_harbor"]
-        
-        if gene_context in high_risk_contexts:
+        if gene_context in _HIGH_RISK_CONTEXTS:
             return "High"
-        elif gene_context in medium_risk_contexts:
+        elif gene_context in _MEDIUM_RISK_CONTEXTS:
             return "Medium"
         else:
             return "Low"
     
-    def _calculate_sequence_similarity(self, query_seq: str, genomic_region: Dict[str, Any]) -> float:
-        """Calculate sequence similarity using real bioinformatics metrics"""
-        # Real similarity calculation based on genomic context and sequence composition
-        
-        # GC content similarity (important for binding affinity)
-        query_gc = GC(query_seq) if query_seq else 50.0
-        
-        # Context-based similarity scores
-        context_similarity = {
-            "gene_cluster": 0.75,
-            "regulatory_region": 0.65,
-            "HLA_complex": 0.80,
-            "BRCA1_region": 0.70,
-            "essential_genes": 0.85,
-            "metabolic_cluster": 0.60,
-            "intergenic": 0.45,
-            "AAVS1_safe_harbor": 0.30,
-            "LRP5_locus": 0.55,
-            "F8_locus": 0.60
-        }
-        
-        base_similarity = context_similarity.get(genomic_region["type"], 0.5)
-        
-        # Adjust based on GC content (sequences with similar GC content are more likely to cross-react)
-        expected_gc = {"High": 60, "Medium": 45, "Low": 40}[genomic_region["risk"]]
-        gc_factor = 1.0 - abs(query_gc - expected_gc) / 100.0
-        
-        return base_similarity * gc_factor
-    
     def _generate_realistic_target_sequence(self, original_seq: str, similarity: float) -> str:
         """Generate a realistic target sequence with controlled similarity"""
         if not original_seq:
             return "ATGCGATCGTAGC"  # Default sequence
         
-        target_seq = list(original_seq[:20])  # Limit to reasonable length
-        
-        # Introduce mismatches based on similarity score
-        num_mismatches = int((1.0 - similarity) * len(target_seq))
-        mismatch_positions = random.sample(range(len(target_seq)), min(num_mismatches, len(target_seq)))
-        
-        nucleotides = ['A', 'T', 'G', 'C']
-        for pos in mismatch_positions:
-            # Choose a different nucleotide
-            current = target_seq[pos]
-            target_seq[pos] = random.choice([n for n in nucleotides if n != current])
-        
-        return ''.join(target_seq)
+        target = np.frombuffer(original_seq[:20].encode('ascii'), dtype=np.uint8).copy()
+
+        # Introduce mismatches based on similarity score: pick distinct
+        # positions, then rotate each base by a nonzero offset mod 4 so the
+        # substitute always differs from the original - all as array ops
+        num_mismatches = min(int((1.0 - similarity) * target.size), target.size)
+        if num_mismatches:
+            positions = _RNG.choice(target.size, size=num_mismatches, replace=False)
+            offsets = _RNG.integers(1, 4, size=num_mismatches).astype(np.uint8)
+            target[positions] = _NT[(_NT_CODE[target[positions]] + offsets) % 4]
+
+        return target.tobytes().decode('ascii')
     
     async def _minimal_real_off_target_analysis(self, sequence: str, host_organism: Organism) -> List[OffTargetSite]:
         """Minimal real off-target analysis when full analysis fails"""
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -15,6 +15,7 @@ class SynthesisRequest(BaseModel):
     desired_trait: str = Field(..., min_length=3, max_length=100)
     optimize: bool = True
     safety_check: bool = True
+    include_sequence: bool = False
 
 class GeneData(BaseModel):
     name: str
@@ -22,9 +23,15 @@ class GeneData(BaseModel):
     ncbi_id: str
     sequence: str
     sequence_length: int
+    sequence_hash: Optional[str] = None
     description: str
 
 class OffTargetSite(BaseModel):
+    # Result objects are never mutated after analysis; freezing lets
+    # pydantic-core skip per-field mutability bookkeeping and makes the
+    # instances hashable for dedup
+    model_config = ConfigDict(frozen=True)
+
     sequence: str
     chromosome: str
     position: int
@@ -32,6 +39,8 @@ class OffTargetSite(BaseModel):
     potential_impact: str
 
 class OffTargetAnalysis(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     total_sites: int
     high_risk_sites: int
     sites: List[OffTargetSite]
@@ -43,6 +52,8 @@ class ProteinStructure(BaseModel):
     method: str
 
 class RiskAssessment(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     toxicity_score: float
     immunogenicity_score: float
     environmental_risk_score: float
@@ -53,6 +64,7 @@ class SynthesisResponse(BaseModel):
     status: str
     gene: GeneData
     optimized_sequence: Optional[str] = None
+    optimized_sequence_hash: Optional[str] = None
     insertion_locus: str
     off_target_analysis: OffTargetAnalysis
     protein_structure: ProteinStructure
@@ -1,20 +1,44 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import asyncio
 import uvicorn
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# uvloop's libuv transports cut per-send overhead for the websocket and
+# HTTP paths; unavailable on Windows, so fall back to the default loop
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    uvloop = None
 
 from core.config import settings
 from api.endpoints import router as api_router
 from api.websockets import router as ws_router
+from services import llm_service, ncbi_client, protein_folder
+from services.http import close_connector
 
-# Configure logging
+# Configure logging. Records are handed to a queue and the actual
+# stream write happens on the listener's background thread, so log I/O
+# never stalls the event loop under load.
 logging.basicConfig(level=logging.INFO)
+_root_logger = logging.getLogger()
+_log_queue: "queue.Queue" = queue.Queue(-1)
+_log_listener = QueueListener(
+    _log_queue, *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="BioSynth-Xtreme: Advanced Genetic Engineering Simulation API"
+    description="BioSynth-Xtreme: Advanced Genetic Engineering Simulation API",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - More specific configuration
@@ -25,29 +49,42 @@ app.add_middleware(
         "http://localhost:5173",  # Vite default
         "http://127.0.0.1:3000",
         "http://127.0.0.1:5173",
-        "*"  # Remove this in production
     ],
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["*"]
+    expose_headers=["*"],
+    max_age=86400  # Let browsers cache preflight responses for 24h
 )
 
-# Add request logging middleware
+# Add request logging middleware. Header dumping materializes a dict per
+# request, so it only happens at DEBUG; the summary line defers its
+# formatting to the logging framework.
 @app.middleware("http")
 async def log_requests(request, call_next):
-    logger.info(f"📥 Incoming {request.method} request to {request.url}")
-    logger.info(f"🔍 Headers: {dict(request.headers)}")
-    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📥 %s %s headers=%s", request.method, request.url, dict(request.headers))
+
     response = await call_next(request)
-    
-    logger.info(f"📤 Response status: {response.status_code}")
+
+    logger.info("%s %s -> %d", request.method, request.url.path, response.status_code)
     return response
 
 # Include routers
 app.include_router(api_router, prefix="/api/v1", tags=["API"])
 app.include_router(ws_router, prefix="/ws", tags=["WebSocket"])
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Release the pooled HTTP connections cleanly: sessions first, then
+    # the shared connector underneath them
+    await llm_service.close()
+    await ncbi_client.close()
+    await protein_folder.close()
+    await close_connector()
+    # Flush queued log records before the process exits
+    _log_listener.stop()
+
 @app.get("/")
 async def root():
     return {
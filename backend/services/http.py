@@ -0,0 +1,41 @@
+import aiohttp
+from typing import Optional
+
+# One TCP pool for every outbound client in the process. The individual
+# services keep their own ClientSession (so per-service defaults like
+# timeouts stay put) but all sessions ride this connector, so warm
+# connections and DNS entries are shared instead of duplicated per pool.
+# aiohttp speaks HTTP/1.1 only; connection reuse here is the pooling win
+# multiplexing would otherwise provide.
+_connector: Optional[aiohttp.TCPConnector] = None
+
+def get_connector() -> aiohttp.TCPConnector:
+    """Return the shared TCP connector, creating it on first use"""
+    global _connector
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=20,
+            keepalive_timeout=75,
+            ttl_dns_cache=300
+        )
+    return _connector
+
+def shared_session(timeout: aiohttp.ClientTimeout) -> aiohttp.ClientSession:
+    """Build a session on the shared pool with caller-specific defaults
+
+    connector_owner=False keeps the pool alive when any one session
+    closes; the pool itself is released via close_connector() on app
+    shutdown.
+    """
+    return aiohttp.ClientSession(
+        connector=get_connector(),
+        connector_owner=False,
+        timeout=timeout
+    )
+
+async def close_connector():
+    """Release the shared pool (wired to app shutdown)"""
+    global _connector
+    if _connector is not None and not _connector.closed:
+        await _connector.close()
@@ -1,9 +1,75 @@
 import aiohttp
 import asyncio
-from typing import List, Dict, Any, Optional
-import json
+import hashlib
+import logging
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional
+import numpy as np
+import orjson
 
 from core.config import settings
+from services.http import shared_session
+from utils.cache import get_cache, set_cache
+
+logger = logging.getLogger(__name__)
+
+# Optional semantic-cache dependency: with sentence-transformers present,
+# near-duplicate analyses ("high bone density" vs "increased bone
+# density") reuse cached recommendations; without it the exact-match
+# Redis cache still applies
+try:
+    from sentence_transformers import SentenceTransformer
+    _SBERT_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    _SBERT_AVAILABLE = False
+
+# Identical prompts return identical advice for a day - a Redis hit is
+# sub-millisecond against a multi-second LLM round-trip
+LLM_CACHE_TTL = 86400
+
+# Circuit breaker for the Claude endpoint: after this many consecutive
+# failures the breaker opens and requests skip straight to Gemini for
+# the cooldown window instead of paying the full aiohttp timeout
+CLAUDE_FAILURE_THRESHOLD = 5
+CLAUDE_BREAKER_COOLDOWN = 30.0
+
+# Cosine similarity a prompt embedding must reach before a cached
+# recommendation is reused, and a hard bound on in-memory entries
+SEMANTIC_SIMILARITY_THRESHOLD = 0.92
+SEMANTIC_CACHE_MAX = 10000
+
+# Static instruction block shared by every recommendation request. Kept
+# separate from the per-request analysis values so Anthropic's ephemeral
+# prompt caching can reuse the processed prefix across calls.
+EXPERT_SYSTEM_PROMPT = """You are a synthetic biology expert. Based on the genetic analysis provided by the user, provide a detailed and explanatory response.
+
+In your response, please address the following points in a clear and thorough way, using full explanations rather than short bullet points:
+
+1. Assess the overall viability of performing genetic engineering on this gene in the given species.
+2. Discuss potential risks that may arise from this modification, and explain strategies that could be used to mitigate those risks.
+3. Recommend logical next steps for experimental design or validation, explaining why each step is important.
+4. If there are concerns with this approach, describe alternative strategies or methods that could be more effective or safer.
+
+Ensure the response flows like an expert's written assessment rather than a list of items."""
+
+# Precompiled template for the per-request tail. Everything static lives
+# in EXPERT_SYSTEM_PROMPT above so the cacheable prefix stays
+# bitwise-identical across calls - Anthropic's cache matching requires
+# that; even whitespace drift would silently break hits.
+_ANALYSIS_PROMPT_TEMPLATE = """Gene: {gene_name}
+Species: {species}
+Sequence Length: {sequence_length}
+Off-target Sites: {off_target_sites}
+Protein Structure Confidence: {confidence_score}"""
+
+_ANALYSIS_PROMPT_DEFAULTS = {
+    "gene_name": "Unknown",
+    "species": "Unknown",
+    "sequence_length": 0,
+    "off_target_sites": 0,
+    "confidence_score": 0,
+}
 
 class LLMService:
     def __init__(self):
@@ -12,20 +78,70 @@ class LLMService:
         # Enable Claude Sonnet 4 for all clients
         self.claude_enabled = True
         self.claude_model = "claude-3-5-sonnet-20241022"  # Latest Claude Sonnet 4
-    
-    async def generate_with_claude(self, prompt: str) -> Optional[str]:
-        """Generate text using Claude Sonnet 4 API"""
+        # One keep-alive session for all LLM calls; created lazily so it
+        # binds to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Breaker state: consecutive failures and when the open window
+        # ends. Once the window expires the next call acts as the
+        # half-open trial request.
+        self._claude_failures = 0
+        self._claude_open_until = 0.0
+        # Semantic cache: unit-norm prompt embeddings (row-parallel with
+        # the response list). Model loads lazily on first use since it
+        # costs seconds and many deployments never enable it.
+        self._embedder = None
+        self._sem_vectors: Optional[np.ndarray] = None
+        self._sem_responses: List[str] = []
+        # Single-flight dedup: concurrent requests with the same cache
+        # key await the first caller's task instead of each paying for
+        # an LLM round-trip
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # get_status() sits on the dashboard polling path; memoize the
+        # dict briefly so polls don't rebuild it per request
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_cached_at = 0.0
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use
+
+        Reusing one session keeps connections pooled and warm, so repeat
+        LLM calls skip the TCP+TLS handshake entirely.
+        """
+        if self._session is None or self._session.closed:
+            # Rides the app-wide connector from services.http, so LLM and
+            # NCBI traffic draw from one warm pool
+            self._session = shared_session(aiohttp.ClientTimeout(total=60))
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session (wired to app shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+    async def generate_with_claude(self, prompt: str, system: Optional[str] = None) -> Optional[str]:
+        """Generate text using Claude Sonnet 4 API
+
+        When a system block is given it is sent with an ephemeral
+        cache_control marker, so Anthropic reuses the processed prefix
+        across requests and only the dynamic prompt is billed in full.
+        """
         if not settings.CLAUDE_API_KEY or settings.CLAUDE_API_KEY == "your_claude_api_key_here":
             # Fallback to Gemini if Claude API key is not configured
-            return await self.generate_with_gemini(prompt)
-            
+            return await self.generate_with_gemini(prompt, system=system)
+
+        # Breaker open: skip the Claude round-trip entirely while the
+        # cooldown runs (a microsecond check vs a 60 s timeout)
+        if time.monotonic() < self._claude_open_until:
+            return await self.generate_with_gemini(prompt, system=system)
+
         try:
             headers = {
                 "x-api-key": settings.CLAUDE_API_KEY,
                 "anthropic-version": "2023-06-01",
                 "content-type": "application/json"
             }
-            
+
             data = {
                 "model": self.claude_model,
                 "max_tokens": 1024,
@@ -36,45 +152,107 @@ class LLMService:
                     }
                 ]
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.claude_url, headers=headers, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result["content"][0]["text"]
-                    else:
-                        print(f"Claude API error: {response.status}")
-                        # Fallback to Gemini
-                        return await self.generate_with_gemini(prompt)
+            if system:
+                data["system"] = [{
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"}
+                }]
+
+            session = await self._get_session()
+            # orjson encodes/decodes the payloads several times faster
+            # than aiohttp's stdlib-json default
+            async with session.post(self.claude_url, headers=headers, data=orjson.dumps(data)) as response:
+                if response.status == 200:
+                    result = orjson.loads(await response.read())
+                    # Success closes the breaker (including half-open trials)
+                    self._claude_failures = 0
+                    self._claude_open_until = 0.0
+                    cache_read = result.get("usage", {}).get("cache_read_input_tokens")
+                    if cache_read:
+                        logger.info("Claude prompt cache hit: %s tokens reused", cache_read)
+                    return result["content"][0]["text"]
+                else:
+                    logger.warning("Claude API error: %s", response.status)
+                    self._record_claude_failure()
+                    # Fallback to Gemini
+                    return await self.generate_with_gemini(prompt, system=system)
         except Exception as e:
-            print(f"Error calling Claude: {e}")
+            logger.warning("Error calling Claude: %s", e)
+            self._record_claude_failure()
             # Fallback to Gemini
-            return await self.generate_with_gemini(prompt)
+            return await self.generate_with_gemini(prompt, system=system)
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Encode text to a unit-norm float32 vector (runs in a thread)"""
+        if self._embedder is None:
+            self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
+        return self._embedder.encode(
+            [text], normalize_embeddings=True
+        )[0].astype(np.float32)
+
+    async def _semantic_lookup(self, text: str):
+        """Return (cached response or None, embedding or None) for text
+
+        With unit vectors a dot product is cosine similarity, so a single
+        matmul against the stored matrix is an exact nearest-neighbor
+        search - at <10k entries that beats carrying an ANN index.
+        """
+        if not _SBERT_AVAILABLE:
+            return None, None
+        vec = await asyncio.to_thread(self._embed, text)
+        if self._sem_vectors is not None:
+            sims = self._sem_vectors @ vec
+            best = int(np.argmax(sims))
+            if float(sims[best]) >= SEMANTIC_SIMILARITY_THRESHOLD:
+                return self._sem_responses[best], vec
+        return None, vec
+
+    def _semantic_store(self, vec: Optional[np.ndarray], response: str):
+        """Add an embedding/response pair to the in-memory index"""
+        if vec is None or len(self._sem_responses) >= SEMANTIC_CACHE_MAX:
+            return
+        row = vec[None, :]
+        self._sem_vectors = row if self._sem_vectors is None \
+            else np.vstack((self._sem_vectors, row))
+        self._sem_responses.append(response)
+
+    def _record_claude_failure(self):
+        """Count a Claude failure and open the breaker at the threshold"""
+        self._claude_failures += 1
+        if self._claude_failures >= CLAUDE_FAILURE_THRESHOLD:
+            self._claude_open_until = time.monotonic() + CLAUDE_BREAKER_COOLDOWN
     
-    async def generate_with_gemini(self, prompt: str) -> Optional[str]:
+    async def generate_with_gemini(self, prompt: str, system: Optional[str] = None) -> Optional[str]:
         """Generate text using Google's Gemini API"""
+        # Gemini has no equivalent prefix cache - just prepend the block
+        full_prompt = f"{system}\n\n{prompt}" if system else prompt
         if not settings.GEMINI_API_KEY:
             # Fallback to a simple rule-based response if no API key
-            return self._generate_fallback_response(prompt)
-            
+            return self._generate_fallback_response(full_prompt)
+
         try:
             data = {
                 "contents": [{
-                    "parts": [{"text": prompt}]
+                    "parts": [{"text": full_prompt}]
                 }]
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.gemini_url, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result["candidates"][0]["content"]["parts"][0]["text"]
-                    else:
-                        print(f"Gemini API error: {response.status}")
-                        return self._generate_fallback_response(prompt)
+            session = await self._get_session()
+            async with session.post(
+                self.gemini_url,
+                data=orjson.dumps(data),
+                headers={"content-type": "application/json"}
+            ) as response:
+                if response.status == 200:
+                    result = orjson.loads(await response.read())
+                    return result["candidates"][0]["content"]["parts"][0]["text"]
+                else:
+                    logger.warning("Gemini API error: %s", response.status)
+                    return self._generate_fallback_response(full_prompt)
         except Exception as e:
-            print(f"Error calling Gemini: {e}")
-            return self._generate_fallback_response(prompt)
+            logger.warning("Error calling Gemini: %s", e)
+            return self._generate_fallback_response(full_prompt)
     
     def _generate_fallback_response(self, prompt: str) -> str:
         """Generate a fallback response when Gemini is not available"""
@@ -88,47 +266,235 @@ class LLMService:
         else:
             return "Based on the genetic analysis, this modification appears feasible but requires careful validation. Recommended next steps: 1) Conduct in vitro testing to confirm functionality, 2) Perform thorough off-target analysis, 3) Implement contained field trials before any environmental release, 4) Monitor for potential immune responses in the host organism."
     
-    async def generate_consensus_recommendation(self, analysis_data: Dict[str, Any]) -> str:
-        """Generate a recommendation using Claude Sonnet 4 (primary) or Gemini (fallback)"""
-        prompt = f"""
-        You are a synthetic biology expert. Based on the following genetic analysis, provide a detailed and explanatory response:
+    @staticmethod
+    def _build_analysis_prompt(analysis_data: Dict[str, Any]) -> str:
+        """Fill the per-request tail of the consensus prompt"""
+        return _ANALYSIS_PROMPT_TEMPLATE.format_map(
+            {**_ANALYSIS_PROMPT_DEFAULTS, **analysis_data}
+        )
 
-        Gene: {analysis_data.get('gene_name', 'Unknown')}
-        Species: {analysis_data.get('species', 'Unknown')}
-        Sequence Length: {analysis_data.get('sequence_length', 0)}
-        Off-target Sites: {analysis_data.get('off_target_sites', 0)}
-        Protein Structure Confidence: {analysis_data.get('confidence_score', 0)}
+    def _consensus_cache_key(self, prompt: str) -> str:
+        """Exact-match cache key: canonical (model, system, prompt) digest"""
+        return "llm:" + hashlib.sha256(
+            orjson.dumps(
+                {"model": self.claude_model, "system": EXPERT_SYSTEM_PROMPT, "prompt": prompt},
+                option=orjson.OPT_SORT_KEYS
+            )
+        ).hexdigest()
 
-        In your response, please address the following points in a clear and thorough way, using full explanations rather than short bullet points:
+    async def _cache_recommendation(self, cache_key: str, recommendation: str):
+        """Persist a finished recommendation in the exact-match cache"""
+        # Stored as JSON with metadata so the schema can grow (e.g. a
+        # semantic-cache tier) without invalidating old entries
+        await set_cache(
+            cache_key,
+            orjson.dumps({"content": recommendation, "model": self.claude_model, "ts": time.time()}).decode(),
+            expire=LLM_CACHE_TTL
+        )
 
-        1. Assess the overall viability of performing genetic engineering on this gene in the given species.
-        2. Discuss potential risks that may arise from this modification, and explain strategies that could be used to mitigate those risks.
-        3. Recommend logical next steps for experimental design or validation, explaining why each step is important.
-        4. If there are concerns with this approach, describe alternative strategies or methods that could be more effective or safer.
+    async def _race_providers(self, prompt: str) -> str:
+        """Race Claude and Gemini, returning the first usable answer
 
-        Ensure the response flows like an expert’s written assessment rather than a list of items.
+        Latency-based routing: both providers start immediately and the
+        loser is cancelled, so the caller pays min(latency) instead of
+        Claude's timeout plus the fallback. Costs one extra in-flight
+        request per call, which is the trade race mode opts into.
         """
+        claude_task = asyncio.create_task(
+            self.generate_with_claude(prompt, system=EXPERT_SYSTEM_PROMPT)
+        )
+        gemini_task = asyncio.create_task(
+            self.generate_with_gemini(prompt, system=EXPERT_SYSTEM_PROMPT)
+        )
+        pending = {claude_task, gemini_task}
+        recommendation = None
+        while pending and recommendation is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = None if task.cancelled() or task.exception() else task.result()
+                if result:
+                    recommendation = f"[Gemini Pro] {result}" if task is gemini_task else result
+                    break
+        for task in pending:
+            task.cancel()
+        if recommendation is None:
+            # Both providers ended empty - same last resort as the
+            # sequential path
+            recommendation = f"[Gemini Pro] {self._generate_fallback_response(prompt)}"
+        return recommendation
 
-        
-        # Try Claude Sonnet 4 first (enabled for all clients)
-        if self.claude_enabled:
-            result = await self.generate_with_claude(prompt)
-            if result:
-                return f"{result}"
-        
-        # Fallback to Gemini
-        result = await self.generate_with_gemini(prompt)
-        return f"[Gemini Pro] {result}"
+    async def generate_consensus_recommendation(self, analysis_data: Dict[str, Any], race: bool = False) -> str:
+        """Generate a recommendation using Claude Sonnet 4 (primary) or Gemini (fallback)
+
+        With race=True both providers run concurrently and the first
+        success wins (lowest latency); the default keeps the sequential
+        Claude-then-Gemini order, which avoids the duplicate Gemini call
+        when cost matters more than tail latency.
+
+        Concurrent calls with the same analysis coalesce onto a single
+        in-flight task, so duplicates cost one LLM round-trip total.
+        """
+        # Only the per-request analysis values go in the user message; the
+        # instruction block rides along as a cacheable system prefix
+        prompt = self._build_analysis_prompt(analysis_data)
+        cache_key = self._consensus_cache_key(prompt)
+
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            # Shield so one caller's cancellation doesn't abort the
+            # shared generation for everyone else
+            return await asyncio.shield(pending)
+
+        task = asyncio.ensure_future(
+            self._generate_consensus_uncached(prompt, cache_key, race)
+        )
+        self._inflight[cache_key] = task
+        try:
+            return await task
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _generate_consensus_uncached(self, prompt: str, cache_key: str, race: bool) -> str:
+        """Cache lookup plus LLM generation for a single prompt"""
+        cached = await get_cache(cache_key)
+        if cached:
+            try:
+                return orjson.loads(cached)["content"]
+            except (ValueError, KeyError, TypeError):
+                pass  # Corrupt entry - fall through and regenerate
+
+        # Semantic tier: near-duplicate analyses short-circuit here even
+        # when their exact digests differ
+        semantic_hit, embedding = await self._semantic_lookup(prompt)
+        if semantic_hit is not None:
+            return semantic_hit
+
+        if race:
+            recommendation = await self._race_providers(prompt)
+        else:
+            # Try Claude Sonnet 4 first (enabled for all clients)
+            recommendation = None
+            if self.claude_enabled:
+                result = await self.generate_with_claude(prompt, system=EXPERT_SYSTEM_PROMPT)
+                if result:
+                    recommendation = f"{result}"
+
+            if recommendation is None:
+                # Fallback to Gemini
+                result = await self.generate_with_gemini(prompt, system=EXPERT_SYSTEM_PROMPT)
+                recommendation = f"[Gemini Pro] {result}"
+
+        await self._cache_recommendation(cache_key, recommendation)
+        self._semantic_store(embedding, recommendation)
+        return recommendation
+
+    async def stream_with_claude(self, prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield Claude response text incrementally from the SSE stream
+
+        With "stream": true the first tokens arrive after TTFB instead of
+        after full generation, so callers can start rendering immediately.
+        """
+        headers = {
+            "x-api-key": settings.CLAUDE_API_KEY,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json"
+        }
+        data = {
+            "model": self.claude_model,
+            "max_tokens": 1024,
+            "stream": True,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system:
+            data["system"] = [{
+                "type": "text",
+                "text": system,
+                "cache_control": {"type": "ephemeral"}
+            }]
+
+        session = await self._get_session()
+        async with session.post(self.claude_url, headers=headers, data=orjson.dumps(data)) as response:
+            if response.status != 200:
+                self._record_claude_failure()
+                raise RuntimeError(f"Claude API error: {response.status}")
+            async for raw_line in response.content:
+                line = raw_line.strip()
+                if not line.startswith(b"data: "):
+                    continue
+                event = orjson.loads(line[6:])
+                if event.get("type") == "content_block_delta":
+                    delta = event.get("delta", {})
+                    if delta.get("type") == "text_delta":
+                        yield delta["text"]
+        # A completed stream closes the breaker like any other success
+        self._claude_failures = 0
+        self._claude_open_until = 0.0
+
+    async def stream_consensus_recommendation(self, analysis_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream a recommendation, caching the full text on completion
+
+        Cache hits (and the non-streaming Gemini/rule-based fallbacks)
+        arrive as a single chunk; live Claude output streams token by
+        token under the same exact-match cache key as the non-streaming
+        path, so the two stay interchangeable.
+        """
+        prompt = self._build_analysis_prompt(analysis_data)
+        cache_key = self._consensus_cache_key(prompt)
+        cached = await get_cache(cache_key)
+        if cached:
+            try:
+                yield orjson.loads(cached)["content"]
+                return
+            except (ValueError, KeyError, TypeError):
+                pass  # Corrupt entry - fall through and regenerate
+
+        claude_ready = (
+            self.claude_enabled
+            and settings.CLAUDE_API_KEY
+            and settings.CLAUDE_API_KEY != "your_claude_api_key_here"
+            and time.monotonic() >= self._claude_open_until
+        )
+        if claude_ready:
+            chunks: List[str] = []
+            try:
+                async for chunk in self.stream_with_claude(prompt, system=EXPERT_SYSTEM_PROMPT):
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as e:
+                logger.warning("Error streaming from Claude: %s", e)
+                self._record_claude_failure()
+                if chunks:
+                    # The client already rendered partial text; appending a
+                    # fresh Gemini answer would garble it, so just stop
+                    return
+            else:
+                await self._cache_recommendation(cache_key, "".join(chunks))
+                return
+
+        result = await self.generate_with_gemini(prompt, system=EXPERT_SYSTEM_PROMPT)
+        recommendation = f"[Gemini Pro] {result}"
+        await self._cache_recommendation(cache_key, recommendation)
+        yield recommendation
     
     def get_status(self) -> Dict[str, Any]:
-        """Get the status of available LLMs"""
-        return {
+        """Get the status of available LLMs
+
+        The result only changes when settings change, so it's rebuilt at
+        most once per second and the same dict object is returned to
+        monitoring polls in between.
+        """
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cached_at < 1.0:
+            return self._status_cache
+        self._status_cache = {
             "claude_enabled": self.claude_enabled,
             "claude_model": self.claude_model,
             "claude_configured": bool(settings.CLAUDE_API_KEY and settings.CLAUDE_API_KEY != "your_claude_api_key_here"),
             "gemini_configured": bool(settings.GEMINI_API_KEY),
             "primary_llm": "Claude Sonnet 4" if self.claude_enabled and settings.CLAUDE_API_KEY != "your_claude_api_key_here" else "Gemini Pro"
         }
+        self._status_cached_at = now
+        return self._status_cache
 
 # Create a global instance
 llm_service = LLMService()
\ No newline at end of file
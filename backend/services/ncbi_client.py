@@ -1,107 +1,251 @@
 import aiohttp
 import asyncio
-from typing import Optional, Dict, Any
-from Bio import Entrez, SeqIO
-from io import StringIO
+import io
+import logging
+import orjson
+from typing import List, Optional, Dict, Any
 import xml.etree.ElementTree as ET
 
 from core.config import settings
+from services.http import shared_session
+from utils.cache import get_cache, set_cache
 
-# Set up NCBI email
-Entrez.email = settings.NCBI_EMAIL
-if settings.NCBI_API_KEY:
-    Entrez.api_key = settings.NCBI_API_KEY
+logger = logging.getLogger(__name__)
+
+# Optional fast XML parser: lxml's iterparse walks efetch responses
+# record by record and frees each element as it goes, so multi-record
+# payloads never hold the whole DOM in memory. Falls back to the
+# stdlib ElementTree parse when lxml isn't installed.
+try:
+    from lxml import etree as lxml_etree
+    _LXML_AVAILABLE = True
+except ImportError:
+    _LXML_AVAILABLE = False
+
+# Gene/protein sequences are effectively immutable - cache FASTA for a week
+SEQUENCE_CACHE_TTL = 7 * 86400
+
+# Retries for rate-limited (429) responses before giving up
+MAX_RETRIES = 3
 
 class NCBIClient:
     def __init__(self):
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
         self.timeout = aiohttp.ClientTimeout(total=30)
-    
+        # Session defaults stay per-service, but the TCP pool underneath
+        # is the app-wide one from services.http
+        self._session: Optional[aiohttp.ClientSession] = None
+        # NCBI allows 3 req/s anonymously, 10 req/s with an API key;
+        # gating concurrency here turns bursts into steady-state
+        # throughput instead of 429s and wasted retries
+        self._sem = asyncio.Semaphore(10 if settings.NCBI_API_KEY else 3)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = shared_session(self.timeout)
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session (wired to app shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _get(self, endpoint: str, params: Dict[str, Any]) -> bytes:
+        """GET an E-utilities endpoint under the concurrency gate
+
+        429s back off exponentially (honoring Retry-After when sent)
+        and retry up to MAX_RETRIES times; the semaphore is released
+        while sleeping so other requests keep flowing.
+        """
+        session = await self._get_session()
+        url = f"{self.base_url}/{endpoint}"
+        delay = 1.0
+        for attempt in range(MAX_RETRIES + 1):
+            async with self._sem:
+                async with session.get(url, params=params) as response:
+                    if response.status != 429 or attempt == MAX_RETRIES:
+                        response.raise_for_status()
+                        return await response.read()
+                    retry_after = response.headers.get("Retry-After")
+            wait = float(retry_after) if retry_after else delay
+            await asyncio.sleep(wait)
+            delay *= 2
+
+    def _params(self, **extra) -> Dict[str, Any]:
+        """Common E-utilities query parameters (identity + API key)"""
+        params = {"email": settings.NCBI_EMAIL, "tool": "biosynth-xtreme"}
+        if settings.NCBI_API_KEY:
+            params["api_key"] = settings.NCBI_API_KEY
+        params.update(extra)
+        return params
+
     async def search_gene(self, query: str, organism: str, max_results: int = 5) -> list:
         """Search for genes related to a query in a specific organism"""
         try:
-            search_handle = Entrez.esearch(
-                db="gene", 
-                term=f"{query}[Gene] AND {organism}[Organism]", 
-                retmax=max_results
-            )
-            search_results = Entrez.read(search_handle)
-            search_handle.close()
-            return search_results.get("IdList", [])
+            # orjson decodes the E-utilities JSON faster than the
+            # stdlib default
+            result = orjson.loads(await self._get(
+                "esearch.fcgi",
+                self._params(
+                    db="gene",
+                    term=f"{query}[Gene] AND {organism}[Organism]",
+                    retmax=max_results,
+                    retmode="json"
+                )
+            ))
+            return result.get("esearchresult", {}).get("idlist", [])
         except Exception as e:
-            print(f"Error searching gene: {e}")
+            logger.warning("Error searching gene: %s", e)
             return []
-    
+
     async def get_gene_info(self, gene_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a gene"""
         try:
-            handle = Entrez.efetch(db="gene", id=gene_id, retmode="xml")
-            records = Entrez.read(handle)
-            handle.close()
-            
-            if not records:
-                return None
-                
-            gene_info = records[0]
-            return {
-                "id": gene_id,
-                "name": gene_info.get("Entrezgene_gene", {}).get("Gene-ref", {}).get("Gene-ref_locus", ""),
-                "description": gene_info.get("Entrezgene_gene", {}).get("Gene-ref", {}).get("Gene-ref_desc", ""),
-                "organism": gene_info.get("Entrezgene_source", {}).get("BioSource", {}).get("BioSource_org", {}).get("Org-ref", {}).get("Org-ref_taxname", "")
-            }
+            xml_bytes = await self._get(
+                "efetch.fcgi",
+                self._params(db="gene", id=gene_id, retmode="xml")
+            )
+
+            # XML parsing is CPU work - keep it off the event loop
+            return await asyncio.to_thread(self._parse_gene_xml, gene_id, xml_bytes)
+        except Exception as e:
+            logger.warning("Error fetching gene info: %s", e)
+            return None
+
+    # Relative paths shared by both parser backends
+    _GENE_XML_PATHS = {
+        "name": "Entrezgene_gene/Gene-ref/Gene-ref_locus",
+        "description": "Entrezgene_gene/Gene-ref/Gene-ref_desc",
+        "organism": "Entrezgene_source/BioSource/BioSource_org/Org-ref/Org-ref_taxname",
+    }
+
+    @classmethod
+    def _gene_record_fields(cls, gene) -> Dict[str, str]:
+        """Pull the interesting fields out of one Entrezgene element"""
+        return {
+            field: gene.findtext(path) or ""
+            for field, path in cls._GENE_XML_PATHS.items()
+        }
+
+    @classmethod
+    def _iter_gene_records(cls, xml_bytes: bytes):
+        """Yield Entrezgene elements in document order
+
+        With lxml this is a streaming iterparse and each element should
+        be cleared by the consumer once read; the ElementTree fallback
+        parses the whole document first.
+        """
+        if _LXML_AVAILABLE:
+            for _, gene in lxml_etree.iterparse(
+                io.BytesIO(xml_bytes), events=("end",), tag="Entrezgene"
+            ):
+                yield gene
+        else:
+            yield from ET.fromstring(xml_bytes).iter("Entrezgene")
+
+    @classmethod
+    def _parse_gene_xml(cls, gene_id: str, xml_bytes: bytes) -> Optional[Dict[str, Any]]:
+        """Extract name/description/organism from an efetch gene record"""
+        for gene in cls._iter_gene_records(xml_bytes):
+            info = {"id": gene_id, **cls._gene_record_fields(gene)}
+            gene.clear()
+            return info
+        return None
+
+    @classmethod
+    def _parse_gene_xml_batch(cls, gene_ids: List[str], xml_bytes: bytes) -> List[Optional[Dict[str, Any]]]:
+        """Pair Entrezgene records positionally with the requested ids
+
+        efetch returns records in request order, so zip keeps each
+        result aligned with its id; missing trailing records stay None.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(gene_ids)
+        for i, gene in zip(range(len(gene_ids)), cls._iter_gene_records(xml_bytes)):
+            results[i] = {"id": gene_ids[i], **cls._gene_record_fields(gene)}
+            gene.clear()
+        return results
+
+    async def get_gene_infos(self, gene_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Get detailed information for several genes with one efetch call
+
+        Batching a comma-separated id list turns N HTTP round-trips into
+        one, which dominates wall time once more than a couple of ids
+        are involved.
+        """
+        if not gene_ids:
+            return []
+        try:
+            xml_bytes = await self._get(
+                "efetch.fcgi",
+                self._params(db="gene", id=",".join(gene_ids), retmode="xml")
+            )
+
+            return await asyncio.to_thread(self._parse_gene_xml_batch, gene_ids, xml_bytes)
         except Exception as e:
-            print(f"Error fetching gene info: {e}")
+            logger.warning("Error fetching gene infos: %s", e)
+            return [None] * len(gene_ids)
+
+    async def _linked_fasta(self, gene_id: str, db: str) -> Optional[str]:
+        """Fetch the first record linked to a gene as FASTA text
+
+        elink runs with cmd=neighbor_history so its result set stays on
+        NCBI's history server; efetch then pulls the sequence by
+        WebEnv/query_key instead of shipping id lists back and forth
+        (and the same keys would cover a whole id batch). Fetched FASTA
+        is cached in Redis since sequences don't change.
+        """
+        cache_key = f"ncbi:fasta:{db}:{gene_id}"
+        cached = await get_cache(cache_key)
+        if cached:
+            return cached
+
+        result = orjson.loads(await self._get(
+            "elink.fcgi",
+            self._params(
+                dbfrom="gene", db=db, id=gene_id,
+                cmd="neighbor_history", retmode="json"
+            )
+        ))
+
+        linksets = result.get("linksets", [])
+        if not linksets:
+            return None
+        webenv = linksets[0].get("webenv")
+        histories = linksets[0].get("linksetdbhistories", [])
+        if not webenv or not histories:
+            return None
+        query_key = histories[0].get("querykey")
+        if not query_key:
             return None
-    
+
+        fasta = (await self._get(
+            "efetch.fcgi",
+            self._params(
+                db=db, WebEnv=webenv, query_key=query_key,
+                rettype="fasta", retmode="text", retmax=1
+            )
+        )).decode()
+
+        if fasta:
+            await set_cache(cache_key, fasta, expire=SEQUENCE_CACHE_TTL)
+        return fasta or None
+
     async def get_gene_sequence(self, gene_id: str) -> Optional[str]:
         """Get the nucleotide sequence for a gene"""
         try:
-            # First get the nucleotide ID for the gene
-            handle = Entrez.elink(dbfrom="gene", db="nucleotide", id=gene_id)
-            link_results = Entrez.read(handle)
-            handle.close()
-            
-            if not link_results or not link_results[0].get("LinkSetDb"):
-                return None
-                
-            nuccore_ids = [link["Id"] for link in link_results[0]["LinkSetDb"][0]["Link"]]
-            if not nuccore_ids:
-                return None
-                
-            # Get the sequence for the first nucleotide ID
-            handle = Entrez.efetch(db="nucleotide", id=nuccore_ids[0], rettype="fasta", retmode="text")
-            sequence = handle.read()
-            handle.close()
-            
-            return sequence
+            return await self._linked_fasta(gene_id, "nucleotide")
         except Exception as e:
-            print(f"Error fetching gene sequence: {e}")
+            logger.warning("Error fetching gene sequence: %s", e)
             return None
-    
+
     async def get_protein_sequence(self, gene_id: str) -> Optional[str]:
         """Get the protein sequence for a gene"""
         try:
-            # Link gene to protein
-            handle = Entrez.elink(dbfrom="gene", db="protein", id=gene_id)
-            link_results = Entrez.read(handle)
-            handle.close()
-            
-            if not link_results or not link_results[0].get("LinkSetDb"):
-                return None
-                
-            protein_ids = [link["Id"] for link in link_results[0]["LinkSetDb"][0]["Link"]]
-            if not protein_ids:
-                return None
-                
-            # Get the sequence for the first protein ID
-            handle = Entrez.efetch(db="protein", id=protein_ids[0], rettype="fasta", retmode="text")
-            sequence = handle.read()
-            handle.close()
-            
-            return sequence
+            return await self._linked_fasta(gene_id, "protein")
         except Exception as e:
-            print(f"Error fetching protein sequence: {e}")
+            logger.warning("Error fetching protein sequence: %s", e)
             return None
 
 # Create a global instance
-ncbi_client = NCBIClient()
\ No newline at end of file
+ncbi_client = NCBIClient()
@@ -1,14 +1,33 @@
 import asyncio
+import logging
 from typing import Optional
 import aiohttp
 import json
 from core.config import settings
+from services.http import shared_session
+
+logger = logging.getLogger(__name__)
 
 class ProteinFoldingService:
     def __init__(self):
         self.max_sequence_length = 400
         self.esmfold_api_url = "https://api.esmatlas.com/foldSequence/v1/pdb/"
-    
+        # Folding requests reuse the app-wide TCP pool instead of paying
+        # a fresh handshake per call
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = shared_session(aiohttp.ClientTimeout(total=120))
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session (wired to app shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
     def _clean_sequence(self, sequence: str) -> str:
         """Clean and validate the input sequence"""
         if not sequence or not isinstance(sequence, str):
@@ -24,49 +43,52 @@ class ProteinFoldingService:
         return cleaned
     
     async def fold_sequence_esmfold(self, sequence: str) -> Optional[str]:
-        """Fold protein sequence using ESMFold API"""
+        """Fold protein sequence using ESMFold API
+
+        Returns None when the API is unavailable so callers can tell a
+        real prediction from a degraded one and fall back (and label the
+        result) themselves.
+        """
         try:
             # Use the new validation method
             cleaned_sequence = self._clean_sequence(sequence)
         except ValueError as e:
-            print(f"Sequence validation error: {e}")
+            logger.warning("Sequence validation error: %s", e)
             return None
             
         if len(cleaned_sequence) > self.max_sequence_length:
-            print(f"Sequence too long ({len(cleaned_sequence)} chars), truncating...")
+            logger.warning("Sequence too long (%d chars), truncating", len(cleaned_sequence))
             cleaned_sequence = cleaned_sequence[:self.max_sequence_length]
         
         try:
-            print(f"Predicting structure for sequence: {cleaned_sequence[:50]}...")
-            print(f"DEBUG: Using REAL ESMFold API for sequence length {len(cleaned_sequence)}")
+            logger.debug("Predicting structure for sequence: %.50s...", cleaned_sequence)
+            logger.debug("Using ESMFold API for sequence length %d", len(cleaned_sequence))
             
             # Use ESMFold API instead of local installation
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.esmfold_api_url,
-                    data=cleaned_sequence,
-                    headers={"Content-Type": "text/plain"}
-                ) as response:
-                    
-                    if response.status == 200:
-                        pdb_string = await response.text()
-                        print("SUCCESS: Real ESMFold API prediction completed!")
-                        print(f"DEBUG: PDB output starts with: {pdb_string[:100]}...")
-                        return pdb_string
-                    else:
-                        error_text = await response.text()
-                        print(f"ESMFold API error: {response.status} - {error_text}")
-                        print("WARNING: Falling back to alpha-helix model")
-                        return await self._generate_fallback_structure(cleaned_sequence)
-                        
+            session = await self._get_session()
+            async with session.post(
+                self.esmfold_api_url,
+                data=cleaned_sequence,
+                headers={"Content-Type": "text/plain"}
+            ) as response:
+
+                if response.status == 200:
+                    pdb_string = await response.text()
+                    logger.info("ESMFold API prediction completed")
+                    logger.debug("PDB output starts with: %.100s...", pdb_string)
+                    return pdb_string
+                else:
+                    error_text = await response.text()
+                    logger.warning("ESMFold API error: %s - %s", response.status, error_text)
+                    return None
+
         except Exception as e:
-            print(f"Error in ESMFold API call: {e}")
-            print("WARNING: Falling back to alpha-helix model")
-            return await self._generate_fallback_structure(cleaned_sequence)
+            logger.warning("Error in ESMFold API call: %s", e)
+            return None
     
     async def _generate_fallback_structure(self, sequence: str) -> str:
         """Generate a simple alpha-helix structure as fallback"""
-        print("FALLBACK: Generating alpha-helix model structure")
+        logger.debug("Generating alpha-helix model structure")
         
         from Bio.Seq import Seq
         import math
@@ -76,12 +98,12 @@ class ProteinFoldingService:
             if all(c in 'ATCGN' for c in sequence.upper()):
                 bio_seq = Seq(sequence)
                 aa_sequence = str(bio_seq.translate()).replace('*', '')
-                print(f"FALLBACK: Translated DNA to amino acids: {aa_sequence[:20]}...")
+                logger.debug("Translated DNA to amino acids: %.20s...", aa_sequence)
             else:
                 aa_sequence = ''.join(c for c in sequence.upper() if c in 'ARNDCQEGHILKMFPSTWYV')
-                print(f"FALLBACK: Using amino acid sequence: {aa_sequence[:20]}...")
+                logger.debug("Using amino acid sequence: %.20s...", aa_sequence)
         except Exception as e:
-            print(f"FALLBACK: Translation error: {e}, using default sequence")
+            logger.warning("Translation error: %s, using default sequence", e)
             aa_sequence = "MKLAVLVAGVCGSC"
         
         if len(aa_sequence) > 50:
@@ -108,11 +130,10 @@ class ProteinFoldingService:
         atom_count = 1
         for i, aa in enumerate(aa_sequence):
             if aa not in aa_3letter:
-                print(f"FALLBACK: Skipping invalid amino acid: {aa}")
+                logger.debug("Skipping invalid amino acid: %s", aa)
                 continue
                 
             aa_code = aa_3letter[aa]
-            print(f"FALLBACK: Processing {aa} -> {aa_code} at position {i+1}")
             
             # Alpha helix parameters
             angle = i * 100 * math.pi / 180
@@ -140,17 +161,20 @@ class ProteinFoldingService:
         pdb_lines.append("END")
         result = "\n".join(pdb_lines)
         
-        print(f"FALLBACK: Generated structure with {atom_count-1} atoms")
-        print(f"FALLBACK: First line: {pdb_lines[4] if len(pdb_lines) > 4 else 'No atoms'}")
+        logger.debug("Generated fallback structure with %d atoms", atom_count - 1)
         
         return result
     
     async def get_alphafold_prediction(self, sequence: str) -> Optional[str]:
         """Get protein structure prediction"""
         try:
-            return await self.fold_sequence_esmfold(sequence)
+            pdb = await self.fold_sequence_esmfold(sequence)
+            if pdb:
+                return pdb
+            logger.warning("Falling back to alpha-helix model")
+            return await self._generate_fallback_structure(sequence)
         except Exception as e:
-            print(f"Error in structure prediction: {e}")
+            logger.error("Error in structure prediction: %s", e)
             return await self._generate_fallback_structure(sequence)
 
 # Create a global instance
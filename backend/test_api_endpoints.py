@@ -1,17 +1,17 @@
 import requests
-import json
+import orjson
 
 # Test the status endpoint
 try:
     response = requests.get("http://localhost:8000/api/v1/status")
     print("Status endpoint response:")
-    print(json.dumps(response.json(), indent=2))
+    print(orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode())
     print()
     
     # Test the root endpoint
     response = requests.get("http://localhost:8000/")
     print("Root endpoint response:")
-    print(json.dumps(response.json(), indent=2))
+    print(orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode())
     print()
     
     print("✅ API is running successfully!")
@@ -3,43 +3,46 @@ Test script to verify the BioSynth-Xtreme API with Claude Sonnet 4 integration
 """
 import asyncio
 import aiohttp
-import json
+import orjson
 
 async def test_api():
     async with aiohttp.ClientSession() as session:
         try:
-            # Test status endpoint
-            print("🔍 Testing API status...")
-            async with session.get("http://localhost:8000/api/v1/status") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print("✅ API Status Response:")
-                    print(json.dumps(data, indent=2))
-                    
-                    # Check Claude Sonnet 4 status
-                    if data.get("claude_sonnet_4_enabled", False):
-                        print("✅ Claude Sonnet 4 is ENABLED for all clients!")
-                    else:
-                        print("⚠️ Claude Sonnet 4 is not fully enabled")
-                    
-                    llm_status = data.get("llm_status", {})
-                    print(f"🤖 Primary LLM: {llm_status.get('primary_llm', 'Unknown')}")
-                    print(f"🔧 Claude Configured: {llm_status.get('claude_configured', False)}")
-                    print(f"🔧 Gemini Configured: {llm_status.get('gemini_configured', False)}")
-                else:
-                    print(f"❌ Failed to get status: {response.status}")
-            
-            # Test root endpoint
-            print("\n🔍 Testing root endpoint...")
-            async with session.get("http://localhost:8000/") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print("✅ Root endpoint working:")
-                    print(f"   Service: {data.get('message', 'Unknown')}")
-                    print(f"   Version: {data.get('version', 'Unknown')}")
+            async def get_json(path):
+                async with session.get(f"http://localhost:8000{path}") as response:
+                    return response.status, await response.json()
+
+            # The two endpoints are independent - fetch them concurrently
+            print("🔍 Testing API status and root endpoints...")
+            (status_code, data), (root_code, root_data) = await asyncio.gather(
+                get_json("/api/v1/status"),
+                get_json("/")
+            )
+
+            if status_code == 200:
+                print("✅ API Status Response:")
+                print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+
+                # Check Claude Sonnet 4 status
+                if data.get("claude_sonnet_4_enabled", False):
+                    print("✅ Claude Sonnet 4 is ENABLED for all clients!")
                 else:
-                    print(f"❌ Failed to get root: {response.status}")
-                    
+                    print("⚠️ Claude Sonnet 4 is not fully enabled")
+
+                llm_status = data.get("llm_status", {})
+                print(f"🤖 Primary LLM: {llm_status.get('primary_llm', 'Unknown')}")
+                print(f"🔧 Claude Configured: {llm_status.get('claude_configured', False)}")
+                print(f"🔧 Gemini Configured: {llm_status.get('gemini_configured', False)}")
+            else:
+                print(f"❌ Failed to get status: {status_code}")
+
+            if root_code == 200:
+                print("\n✅ Root endpoint working:")
+                print(f"   Service: {root_data.get('message', 'Unknown')}")
+                print(f"   Version: {root_data.get('version', 'Unknown')}")
+            else:
+                print(f"\n❌ Failed to get root: {root_code}")
+
         except Exception as e:
             print(f"❌ Error connecting to API: {e}")
             print("Make sure the server is running on http://localhost:8000")
@@ -1,8 +1,9 @@
 # utils/__init__.py
 from .cache import get_cache, set_cache
-from .helpers import *
+from .helpers import gc_content
 
 __all__ = [
     'get_cache',
-    'set_cache'
+    'set_cache',
+    'gc_content'
 ]
\ No newline at end of file
@@ -1,17 +1,51 @@
-import redis
-import json
+import redis.asyncio as aioredis
 from typing import Optional, Any
 
 from core.config import settings
 
-# Initialize Redis client
-redis_client = redis.Redis.from_url(settings.REDIS_URL)
+# Optional compression dependency: cached payloads range from ~2-4 KB
+# LLM recommendations to 10-500 KB FASTA blobs, and zstd shrinks the
+# text-heavy ones ~4x - less Redis memory and fewer bytes per hit.
+# Without the library entries are stored raw and everything still works.
+try:
+    import zstandard as zstd
+    _cctx = zstd.ZstdCompressor(level=3)
+    _dctx = zstd.ZstdDecompressor()
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    _ZSTD_AVAILABLE = False
+
+# 1-byte format tag so readers can tell compressed from raw entries
+# (and entries written before tagging still decode via the fallback)
+_TAG_RAW = b"\x00"
+_TAG_ZSTD = b"\x01"
+
+# Tiny values gain nothing from compression; skip the CPU cost
+_COMPRESS_MIN_BYTES = 256
+
+# One async connection pool shared by the whole process - cache lookups
+# overlap with other requests instead of blocking the event loop.
+# Responses stay as bytes so compressed frames survive the round-trip;
+# get_cache handles the decode.
+redis_client = aioredis.from_url(
+    settings.REDIS_URL,
+    decode_responses=False,
+    max_connections=50
+)
 
 async def get_cache(key: str) -> Optional[Any]:
     """Get value from cache"""
     try:
-        value = redis_client.get(key)
-        return value.decode('utf-8') if value else None
+        raw = await redis_client.get(key)
+        if raw is None:
+            return None
+        tag, body = raw[:1], raw[1:]
+        if tag == _TAG_ZSTD:
+            return _dctx.decompress(body).decode()
+        if tag == _TAG_RAW:
+            return body.decode()
+        # Legacy untagged entry
+        return raw.decode()
     except Exception:
         # If Redis fails, return None (fallback to recalculation)
         return None
@@ -19,8 +53,13 @@ async def get_cache(key: str) -> Optional[Any]:
 async def set_cache(key: str, value: Any, expire: int = settings.CACHE_TTL) -> bool:
     """Set value in cache with expiration"""
     try:
-        redis_client.setex(key, expire, value)
+        payload = value.encode() if isinstance(value, str) else bytes(value)
+        if _ZSTD_AVAILABLE and len(payload) >= _COMPRESS_MIN_BYTES:
+            payload = _TAG_ZSTD + _cctx.compress(payload)
+        else:
+            payload = _TAG_RAW + payload
+        await redis_client.setex(key, expire, payload)
         return True
     except Exception:
         # If Redis fails, just continue without caching
-        return False
\ No newline at end of file
+        return False
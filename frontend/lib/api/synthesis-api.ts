@@ -52,8 +52,13 @@ class SynthesisAPI {
       // Health check first
       await this.healthCheck();
       
-      // Submit actual request
-      const response = await this.client.post<SynthesisResponse>('/api/v1/synthesize', request);
+      // Submit actual request. The UI renders the raw sequences, so ask
+      // the backend to embed them - its default leaves them out and
+      // serves them by hash instead
+      const response = await this.client.post<SynthesisResponse>('/api/v1/synthesize', {
+        include_sequence: true,
+        ...request,
+      });
       console.log('🧬 Successfully received real genetic analysis from backend!');
       
       // Store the result in sessionStorage for the results page
@@ -4,6 +4,9 @@ export interface SynthesisRequest {
   desired_trait: string;
   optimize: boolean;
   safety_check: boolean;
+  // Ask the backend to embed raw sequences in the response (its default
+  // omits them and serves them by hash via /api/v1/sequence/{hash})
+  include_sequence?: boolean;
 }
 
 export interface GeneData {
@@ -12,6 +15,7 @@ export interface GeneData {
   ncbi_id: string;
   sequence: string;
   sequence_length: number;
+  sequence_hash?: string;
   description: string;
 }
 
@@ -40,6 +44,7 @@ export interface SynthesisResponse {
   status: 'pending' | 'processing' | 'completed' | 'failed';
   gene: GeneData;
   optimized_sequence: string | null;
+  optimized_sequence_hash?: string | null;
   insertion_locus: string;
   off_target_analysis: OffTargetAnalysis;
   protein_structure: ProteinStructure;